@@ -8,10 +8,15 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
+import ipaddress
 import uuid
 
 from app.core.database import get_db
 from app.core.security import verify_token
+from app.core.session_activity import session_activity_writer
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.session_cache import session_cache, build_auth_models, models_from_claims
 from app.models.user import User, UserSession
 from app.services.auth_service import AuthService
 
@@ -19,6 +24,9 @@ from app.services.auth_service import AuthService
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Peers allowed to report the client address in forwarding headers
+trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES]
+
 
 class AuthenticationError(HTTPException):
     """Custom authentication error"""
@@ -52,28 +60,47 @@ async def get_current_user(
     if not user_id or not session_id:
         raise AuthenticationError("Invalid token payload")
     
-    # Create auth service
+    session_uuid = uuid.UUID(session_id)
+    
+    # Stateless mode: trust the signed user snapshot unless the session may be revoked
+    if settings.AUTH_STATELESS_TOKENS and "usr" in payload:
+        if not revocation_list.might_be_revoked(session_uuid):
+            session, user = models_from_claims(payload, session_uuid)
+            if session.expires_at > datetime.utcnow():
+                session_activity_writer.touch(session.id)
+                request.state.current_user = user
+                request.state.current_session = session
+                return user
+    
+    # Fast path: session validated recently by this process
+    cached = session_cache.get(session_uuid)
+    if cached and str(cached.user["id"]) == user_id:
+        session, user = cached.to_models()
+        session_activity_writer.touch(session.id)
+        request.state.current_user = user
+        request.state.current_session = session
+        return user
+    
+    # Validate session and load its user in one query
     auth_service = AuthService(db)
-    
-    # Validate session
-    session = await auth_service.validate_session(uuid.UUID(session_id))
-    if not session:
+    snapshots = await auth_service.get_session_with_user(session_uuid)
+    if not snapshots:
         raise AuthenticationError("Session not found or expired")
     
-    # Get user
-    user = await auth_service.get_user_by_id(uuid.UUID(user_id))
-    if not user:
+    session_data, user_data = snapshots
+    if str(user_data["id"]) != user_id:
         raise AuthenticationError("User not found")
     
-    # Update session last used time
-    session.last_used_at = datetime.utcnow()
+    session_cache.put(session_data, user_data)
+    session, user = build_auth_models(session_data, user_data)
+    
+    # Record session activity; flushed in bulk by the background writer
+    session_activity_writer.touch(session.id)
     
     # Store user and session in request state for later use
     request.state.current_user = user
     request.state.current_session = session
     
-    await db.commit()
-    
     return user
 
 
@@ -140,17 +167,40 @@ VerifiedUser = Depends(require_email_verified())
 
 
 # Utility functions
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
 def get_client_ip(request: Request) -> str:
-    """Get client IP address from request"""
+    """
+    Get client IP address from request
+
+    Forwarding headers are only believed when the socket peer is one of
+    TRUSTED_PROXIES; X-Forwarded-For is then read right to left, skipping
+    trusted hops, so a client cannot spoof its address by prepending entries.
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or not _is_trusted_proxy(peer):
+        return peer or "unknown"
+    
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted_proxy(hop):
+                return hop
+        if hops:
+            return hops[0]
     
     real_ip = request.headers.get("X-Real-IP")
     if real_ip:
-        return real_ip
+        return real_ip.strip()
     
-    return request.client.host if request.client else "unknown"
+    return peer
 
 
 def get_user_agent(request: Request) -> str:
@@ -0,0 +1,62 @@
+"""
+Background workers
+Start/stop lifecycle shared by the periodic tasks started in main's lifespan
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+import asyncio
+import logging
+
+
+class BackgroundWorker(ABC):
+    """
+    A periodic task on the event loop
+
+    ``start`` spawns a loop that calls ``run_once`` and then ``wait``;
+    ``stop`` cancels it and waits for it to finish. A failing step is
+    counted in ``errors`` and logged, and the loop carries on.
+    """
+
+    # Logged with the exception when run_once fails
+    failure_message = "Background task failed"
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.errors = 0
+        self._logger = logging.getLogger(type(self).__module__)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @abstractmethod
+    async def run_once(self) -> None:
+        """One step of the loop"""
+
+    async def wait(self) -> None:
+        """Pause between steps"""
+        await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.errors += 1
+                self._logger.warning(f"⚠️ {self.failure_message}: {e}")
+            await self.wait()
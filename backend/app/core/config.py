@@ -30,17 +30,49 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = 0
     DATABASE_POOL_TIMEOUT: int = 30
     DATABASE_POOL_RECYCLE: int = 3600
+    # Adaptive pool sizing: grow max_overflow (up to DATABASE_MAX_OVERFLOW_LIMIT)
+    # while p95 checkout waits exceed the target, shrink it back when idle
+    DATABASE_POOL_ADAPTIVE: bool = False
+    DATABASE_MAX_OVERFLOW_LIMIT: int = 20
+    DATABASE_POOL_TARGET_WAIT_MS: float = 50.0
+    DATABASE_POOL_ADAPT_INTERVAL_SECONDS: float = 10.0
+    # Read replicas (JSON list of URLs) serving read-only routes; after a
+    # write, that client's reads stay on the primary for DATABASE_PRIMARY_PIN_SECONDS
+    # (carried by a cookie / X-Primary-Pin-Until header, so it spans workers)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_PRIMARY_PIN_SECONDS: float = 5.0
+    # Prepared statements: "default" caches them per connection; "pgbouncer"
+    # keeps that cache with globally unique statement names, for PgBouncer >= 1.21
+    # in transaction mode with max_prepared_statements > 0; "disabled" re-parses
+    # every query (any pooler)
+    DATABASE_STATEMENT_CACHE_MODE: str = "default"
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+    # SQLAlchemy compiled SQL cache entries (per engine)
+    DATABASE_QUERY_CACHE_SIZE: int = 1200
     
     # Security Configuration
     SECRET_KEY: str = secrets.token_urlsafe(32)
     JWT_SECRET_KEY: str = secrets.token_urlsafe(32)
     JWT_ALGORITHM: str = "HS256"
     
+    # JWT keyring: "kid:secret,kid:secret". Tokens are signed with JWT_ACTIVE_KID
+    # (default: the first entry) and verified with the key named by their kid
+    # header. To rotate, add the new key, deploy, switch JWT_ACTIVE_KID, and drop
+    # the old key once refresh tokens signed with it have expired. When unset,
+    # JWT_SECRET_KEY is the only key.
+    JWT_SIGNING_KEYS: str = ""
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_DECODE_CACHE_SIZE: int = 1024  # recently verified tokens kept per process, 0 = off
+    
     # Token expiration settings
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60  # 1 hour
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # 7 days
     REFRESH_TOKEN_EXPIRE_DAYS_EXTENDED: int = 30  # 30 days for "remember me"
     
+    # A rotated refresh token presented again within this window is treated as a
+    # concurrent refresh (409) rather than token theft (session revoked)
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: float = 10.0
+    
     # Backward compatibility
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
@@ -48,6 +80,48 @@ class Settings(BaseSettings):
     # Password Security
     BCRYPT_ROUNDS: int = 12
     
+    # BCRYPT_ROUNDS is the cost every worker hashes with. Pick it per fleet with
+    # `python -m app.core.password_hashing` (highest cost under BCRYPT_TARGET_MS,
+    # never below the current BCRYPT_ROUNDS). Startup calibration does the same
+    # in each process; only enable it when all workers run on identical hardware
+    BCRYPT_CALIBRATE_ON_STARTUP: bool = False
+    BCRYPT_TARGET_MS: float = 250.0
+    BCRYPT_MAX_ROUNDS: int = 15
+    
+    # Password hashing worker pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 100  # 0 = unbounded
+    
+    # Authentication session cache (per process)
+    AUTH_SESSION_CACHE_ENABLED: bool = True
+    AUTH_SESSION_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_SESSION_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Stateless access tokens: get_current_user trusts a signed user snapshot
+    # and only checks an in-memory revocation filter, so logout takes effect
+    # on other workers within REVOCATION_REFRESH_INTERVAL_SECONDS
+    AUTH_STATELESS_TOKENS: bool = False
+    REVOCATION_REFRESH_INTERVAL_SECONDS: float = 5.0
+    REVOCATION_REBUILD_INTERVAL_SECONDS: float = 600.0
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    
+    # Write-behind flushing of session last_used_at
+    SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 10.0
+    SESSION_ACTIVITY_FLUSH_MAX_PENDING: int = 500
+    # Timestamps kept for retry while the database is down (oldest dropped beyond this)
+    SESSION_ACTIVITY_MAX_BUFFERED: int = 50000
+    
+    # Background cleanup of expired and revoked sessions
+    SESSION_HOUSEKEEPING_ENABLED: bool = True
+    SESSION_HOUSEKEEPING_INTERVAL_SECONDS: float = 3600.0
+    SESSION_HOUSEKEEPING_BATCH_SIZE: int = 1000
+    SESSION_HOUSEKEEPING_MAX_BATCHES: int = 50  # per run
+    SESSION_RETENTION_HOURS: int = 24  # kept this long after expiry or logout
+    SESSION_ARCHIVE_ENABLED: bool = False  # move rows to user_sessions_archive instead of deleting
+    
     # CORS Configuration
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -56,9 +130,23 @@ class Settings(BaseSettings):
         "http://127.0.0.1:3001"
     ]
     
-    # Rate Limiting
+    # List endpoints: above this planner estimate, count_mode=auto skips the exact count
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
+    
+    # Rows fetched per server-side cursor round trip when streaming responses
+    STREAM_BATCH_SIZE: int = 500
+    
+    # Rate Limiting (per client IP, and per email for the same paths)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "sliding_window"  # sliding_window | token_bucket | shared
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 60  # seconds
+    RATE_LIMIT_EMAIL_REQUESTS: int = 10
+    RATE_LIMIT_PATHS: List[str] = ["/api/auth/login", "/api/auth/register"]
+
+    # Reverse proxies (IPs or CIDRs) whose X-Forwarded-For / X-Real-IP headers are
+    # believed; requests from any other peer are keyed on their socket address
+    TRUSTED_PROXIES: List[str] = []
     
     # Email Configuration (for future use)
     SMTP_HOST: Optional[str] = None
@@ -79,7 +167,19 @@ class Settings(BaseSettings):
     # Monitoring & Logging
     LOG_LEVEL: str = "INFO"
     ENABLE_ACCESS_LOG: bool = True
-    ENABLE_METRICS: bool = True
+    # /api/metrics exposes pool state, latencies, key ids and configuration: it is
+    # off by default and, outside development, requires METRICS_TOKEN as a bearer token
+    ENABLE_METRICS: bool = False
+    METRICS_TOKEN: Optional[str] = None
+    # Background health probe; /api/health/ready fails (503) above these limits
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_READY_MAX_POOL_SATURATION: float = 0.9
+    HEALTH_READY_MAX_LOOP_LAG_MS: float = 500.0
+    # On SIGTERM, readiness fails this long before the server stops accepting
+    # requests, so load balancers see the 503 and route elsewhere first
+    # (>= their probe interval; 0 = stop at once)
+    HEALTH_DRAIN_SECONDS: float = 0.0
     
     # Vietnamese Cultural Settings
     DEFAULT_LANGUAGE: str = "vi"
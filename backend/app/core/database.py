@@ -3,31 +3,219 @@ Database configuration and connection management
 SQLAlchemy async setup for PostgreSQL
 """
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
-from sqlalchemy import text
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy import event, text
+from typing import Any, Dict
+import itertools
 import logging
+import time
+import uuid
+
+import orjson
 
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncPool, PoolController
+from app.core.replicas import ReplicaRouter, client_pin_until, pin_key
+from app.core.tokens import load_keyring
 
 logger = logging.getLogger(__name__)
 
+# Prepared statement names: unique per process (and host) so that client
+# connections sharing a PgBouncer server connection never collide
+_statement_prefix = f"__asyncpg_{uuid.uuid4().hex[:12]}"
+_statement_counter = itertools.count()
+
+
+def _statement_name() -> str:
+    return f"{_statement_prefix}_{next(_statement_counter)}__"
+
+
+def statement_cache_connect_args(mode: str, cache_size: int) -> Dict[str, Any]:
+    """
+    asyncpg connect arguments for a statement cache mode
+    (see DATABASE_STATEMENT_CACHE_MODE)
+    """
+    if mode == "disabled":
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": _statement_name,
+        }
+    if mode == "pgbouncer":
+        return {
+            "prepared_statement_cache_size": cache_size,
+            # asyncpg's own cache names statements __asyncpg_stmt_N__
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": _statement_name,
+        }
+    return {"prepared_statement_cache_size": cache_size}
+
+
+def json_dumps(value: Any) -> str:
+    """JSON/JSONB bind serializer (orjson; dates become ISO 8601 strings)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _encode_jsonb(value: str) -> bytes:
+    # Binary jsonb is the JSON text behind a version byte
+    return b"\x01" + value.encode()
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(memoryview(data)[1:])
+
+
+async def _set_json_codecs(connection) -> None:
+    await connection.set_type_codec(
+        "json",
+        encoder=str.encode,
+        decoder=orjson.loads,
+        schema="pg_catalog",
+        format="binary",
+    )
+    await connection.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+
+
+def register_json_codecs(dbapi_connection, connection_record) -> None:
+    """
+    Decode json/jsonb straight from the wire bytes with orjson
+
+    Runs after the dialect's own connect hook, replacing the codecs it
+    registers (stdlib json.loads on a decoded copy of every value).
+    """
+    dbapi_connection.run_async(_set_json_codecs)
+
+
+connect_args = statement_cache_connect_args(
+    settings.DATABASE_STATEMENT_CACHE_MODE,
+    settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+)
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args=connect_args,
+    json_serializer=json_dumps,
+    json_deserializer=orjson.loads,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_timeout=settings.DATABASE_POOL_TIMEOUT,
     pool_recycle=settings.DATABASE_POOL_RECYCLE,
-    poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
+    poolclass=NullPool if settings.ENVIRONMENT == "test" else InstrumentedAsyncPool,
+)
+
+# Resizes the pool's overflow from observed checkout waits (started in main)
+pool_controller = PoolController(
+    get_pool=lambda: engine.sync_engine.pool,
+    min_overflow=settings.DATABASE_MAX_OVERFLOW,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW_LIMIT,
+    target_wait_ms=settings.DATABASE_POOL_TARGET_WAIT_MS,
+    interval=settings.DATABASE_POOL_ADAPT_INTERVAL_SECONDS,
+)
+
+# Read replicas (streaming standbys of DATABASE_URL) for read-only routes
+replica_engines = [
+    create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+        connect_args=connect_args,
+        json_serializer=json_dumps,
+        json_deserializer=orjson.loads,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+for _engine in (engine, *replica_engines):
+    event.listen(_engine.sync_engine, "connect", register_json_codecs)
+
+replica_router = ReplicaRouter(
+    primary=engine,
+    replicas=replica_engines,
+    pin_seconds=settings.DATABASE_PRIMARY_PIN_SECONDS,
 )
 
+# Signs the pins handed to clients, from the active JWT secret so every worker agrees
+_signing_keys, _active_kid = load_keyring(settings)[:2]
+primary_pin_key = pin_key(_signing_keys[_active_kid])
+
+
+def _pin_key(session: Session):
+    """User a session works for, taken from the request it serves"""
+    request = session.info.get("request")
+    user = getattr(request.state, "current_user", None) if request is not None else None
+    return user.id if user is not None else None
+
+
+def _client_pin(session: Session):
+    """Primary pin deadline the client sent with the request, if any"""
+    request = session.info.get("request")
+    if request is None:
+        return None
+    return client_pin_until(
+        request.headers, request.cookies, primary_pin_key, replica_router.pin_seconds
+    )
+
+
+class RoutingSession(Session):
+    """
+    Session that sends read-only work to a replica
+
+    Sessions opened with info={"read_only": True} read from one replica
+    for their whole lifetime (or from the primary while their client is
+    pinned); flushes and INSERT/UPDATE/DELETE statements always go to the
+    primary, as does everything in an ordinary session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if isinstance(clause, UpdateBase) or self._flushing:
+            self.info["wrote"] = True
+            return engine.sync_engine
+        if self.info.get("read_only"):
+            bind = self.info.get("read_bind")
+            if bind is None:
+                bind = self.info["read_bind"] = replica_router.read_bind(
+                    _pin_key(self), _client_pin(self)
+                )
+            return bind
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer_to_primary(session: Session) -> None:
+    # Make the writer's own follow-up reads (from any worker) see the commit
+    if not session.info.pop("wrote", False) or not replica_engines:
+        return
+    replica_router.pin(_pin_key(session))
+    request = session.info.get("request")
+    if request is not None:
+        # Sent back to the client by PrimaryPinMiddleware
+        request.state.primary_pin_until = time.time() + replica_router.pin_seconds
+
+
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -37,11 +225,39 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
-async def get_db() -> AsyncSession:
+def statement_cache_metrics() -> Dict[str, Any]:
+    """Statement cache configuration and compiled-cache fill of the primary engine"""
+    compiled_cache = engine.sync_engine._compiled_cache
+    return {
+        "mode": settings.DATABASE_STATEMENT_CACHE_MODE,
+        "prepared_statement_cache_size": connect_args["prepared_statement_cache_size"],
+        "compiled_cache_entries": len(compiled_cache) if compiled_cache is not None else 0,
+        "compiled_cache_size": settings.DATABASE_QUERY_CACHE_SIZE,
+    }
+
+
+async def get_db(request: Request) -> AsyncSession:
     """
     Dependency to get database session
     """
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(info={"request": request}) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """
+    Dependency to get a read-only database session
+
+    Served by a replica when DATABASE_REPLICA_URLS is set, unless the
+    client wrote within the last DATABASE_PRIMARY_PIN_SECONDS
+    """
+    async with AsyncSessionLocal(info={"request": request, "read_only": True}) as session:
         try:
             yield session
         except Exception:
@@ -64,10 +280,20 @@ async def init_db():
         logger.error(f"❌ Database connection failed: {e}")
         raise
 
+    for replica in replica_engines:
+        try:
+            async with replica.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            logger.info(f"✅ Read replica {replica.url.host}:{replica.url.port} reachable")
+        except Exception as e:
+            logger.warning(f"⚠️ Read replica {replica.url.host}:{replica.url.port} unreachable: {e}")
+
 
 async def close_db():
     """
     Close database connections
     """
+    for replica in replica_engines:
+        await replica.dispose()
     await engine.dispose()
-    logger.info("🔌 Database connections closed")
\ No newline at end of file
+    logger.info("🔌 Database connections closed")
@@ -0,0 +1,197 @@
+"""
+Background health probing
+Refreshes database status, pool saturation and event-loop lag on an
+interval so health endpoints never touch the connection pool
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import signal
+import time
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.core.background import BackgroundWorker
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+# Event-loop lag is sampled this often within each probe interval
+LAG_SAMPLE_SECONDS = 0.25
+
+
+class HealthProber(BackgroundWorker):
+    """
+    Keeps a cached health snapshot of this worker
+
+    Every ``interval`` the prober runs SELECT 1 on one pooled connection
+    (skipped while the pool is saturated, so it never queues behind
+    requests) and records the worst event-loop lag seen in between.
+    Readiness fails when the database is down or the snapshot is stale,
+    when pool saturation reaches ``max_pool_saturation``, when loop lag
+    exceeds ``max_loop_lag_ms``, and once draining has begun on shutdown,
+    so load balancers stop routing here before the pool is exhausted.
+    """
+
+    failure_message = "Health probe failed"
+
+    def __init__(
+        self,
+        interval: float,
+        timeout: float,
+        max_pool_saturation: float,
+        max_loop_lag_ms: float
+    ):
+        super().__init__()
+        self.interval = interval
+        self.timeout = timeout
+        self.max_pool_saturation = max_pool_saturation
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.started_at = time.monotonic()
+        self.draining = False
+        self.database = "unknown"
+        self.database_latency_ms: Optional[float] = None
+        self.pool: Dict[str, Any] = {}
+        self.loop_lag_ms = 0.0
+        self.checked_at: Optional[datetime] = None
+        self._checked_at_monotonic: Optional[float] = None
+        self.probes = 0
+        self.failures = 0
+        self.skipped = 0
+
+    def _pool_snapshot(self) -> Dict[str, Any]:
+        pool = engine.sync_engine.pool
+        if not isinstance(pool, QueuePool):
+            return {"saturation": None}
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        return {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity else None,
+        }
+
+    async def _select_one(self) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def probe(self) -> None:
+        """Refresh the database and pool parts of the snapshot"""
+        self.pool = self._pool_snapshot()
+        saturation = self.pool["saturation"]
+        if saturation is not None and saturation >= 1:
+            # Waiting for a connection would only add to the queue
+            self.skipped += 1
+        else:
+            start = time.perf_counter()
+            was_unhealthy = self.database.startswith("unhealthy")
+            try:
+                await asyncio.wait_for(self._select_one(), self.timeout)
+                self.database = "healthy"
+                self.database_latency_ms = round((time.perf_counter() - start) * 1000, 3)
+                if was_unhealthy:
+                    logger.info("✅ Database reachable again")
+            except Exception as e:
+                self.failures += 1
+                self.database = f"unhealthy: {str(e) or type(e).__name__}"
+                self.database_latency_ms = None
+                if not was_unhealthy:
+                    logger.warning(f"⚠️ Health probe failed: {self.database}")
+
+        self.probes += 1
+        self.checked_at = datetime.utcnow()
+        self._checked_at_monotonic = time.monotonic()
+
+    async def _sample_loop_lag(self, duration: float) -> float:
+        """Worst scheduling delay (ms) of short sleeps over ``duration``"""
+        loop = asyncio.get_running_loop()
+        worst = 0.0
+        deadline = loop.time() + duration
+        while loop.time() < deadline:
+            before = loop.time()
+            await asyncio.sleep(LAG_SAMPLE_SECONDS)
+            worst = max(worst, loop.time() - before - LAG_SAMPLE_SECONDS)
+        return round(worst * 1000, 3)
+
+    def not_ready_reasons(self) -> List[str]:
+        reasons = []
+        if self.draining:
+            reasons.append("draining")
+        if self._checked_at_monotonic is None:
+            reasons.append("starting")
+        elif time.monotonic() - self._checked_at_monotonic > self.interval * 3 + self.timeout:
+            reasons.append("health snapshot is stale")
+        if self.database.startswith("unhealthy"):
+            reasons.append("database unavailable")
+        saturation = self.pool.get("saturation")
+        if saturation is not None and saturation >= self.max_pool_saturation:
+            reasons.append("connection pool saturated")
+        if self.loop_lag_ms > self.max_loop_lag_ms:
+            reasons.append("event loop lagging")
+        return reasons
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "database": self.database,
+            "database_latency_ms": self.database_latency_ms,
+            "pool": self.pool,
+            "event_loop_lag_ms": self.loop_lag_ms,
+            "checked_at": self.checked_at.isoformat() + "Z" if self.checked_at else None,
+        }
+
+    def drain(self) -> None:
+        """Fail readiness from now on (called at shutdown)"""
+        self.draining = True
+
+    def drain_on_sigterm(self, seconds: float) -> None:
+        """
+        Start draining on SIGTERM and pass the signal on ``seconds`` later
+
+        The server closes its listeners as soon as it sees the signal, so
+        the wait has to happen before then: meanwhile readiness returns 503
+        and requests are still served. A second SIGTERM stops at once.
+        Call from lifespan startup, after the server installed its handler.
+        """
+        previous = signal.getsignal(signal.SIGTERM)
+        if not callable(previous):
+            return
+        loop = asyncio.get_running_loop()
+
+        def handle_sigterm(signum, frame):
+            if self.draining:
+                previous(signum, frame)
+                return
+            self.drain()
+            loop.call_soon_threadsafe(loop.call_later, seconds, previous, signum, None)
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
+    async def run_once(self) -> None:
+        await self.probe()
+
+    async def wait(self) -> None:
+        self.loop_lag_ms = await self._sample_loop_lag(self.interval)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "probes": self.probes,
+            "failures": self.failures,
+            "skipped_saturated": self.skipped,
+            "ready": not self.not_ready_reasons(),
+            "draining": self.draining,
+        }
+
+
+# Process-wide prober instance
+health_prober = HealthProber(
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    max_pool_saturation=settings.HEALTH_READY_MAX_POOL_SATURATION,
+    max_loop_lag_ms=settings.HEALTH_READY_MAX_LOOP_LAG_MS,
+)
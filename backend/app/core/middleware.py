@@ -0,0 +1,63 @@
+"""
+Request instrumentation middleware
+Timing headers and access logging in a single pure-ASGI layer
+"""
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("app.main")
+
+
+class InstrumentationMiddleware:
+    """
+    Adds X-Process-Time / X-API-Version headers and logs each request
+
+    Unlike BaseHTTPMiddleware this never wraps the response body in a
+    stream or spawns a task per request: it only edits the headers of the
+    http.response.start message as it passes through. X-Process-Time is
+    the time until the response started; the access log records the time
+    until the last body chunk was sent.
+    """
+
+    def __init__(self, app: ASGIApp, api_version: str, access_log: bool = True):
+        self.app = app
+        self.api_version = api_version
+        self.access_log = access_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        log = self.access_log and logger.isEnabledFor(logging.INFO)
+        method, path = scope["method"], scope["path"]
+        status_code = 500
+
+        if log:
+            client = scope.get("client")
+            logger.info(f"📥 {method} {path} - {client[0] if client else 'unknown'}")
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+                headers["X-API-Version"] = self.api_version
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if log:
+                process_time = time.perf_counter() - start_time
+                logger.info(
+                    f"📤 {method} {path} - "
+                    f"Status: {status_code} - "
+                    f"Time: {process_time:.4f}s"
+                )
@@ -0,0 +1,241 @@
+"""
+Async password hashing facade
+Runs bcrypt in a bounded worker pool so hashing never blocks the event loop,
+calibrates the bcrypt cost to the host and upgrades stale hashes after login
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+import asyncio
+import logging
+import math
+import time
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.security import pwd_context
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_password(password: str, rounds: int) -> str:
+    """Worker entry point (module level so process pools can pickle it)"""
+    return pwd_context.hash(password, rounds=rounds)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Worker entry point (module level so process pools can pickle it)"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _time_hash(rounds: int) -> float:
+    """Seconds taken by one hash at the given cost"""
+    started_at = time.perf_counter()
+    pwd_context.hash("calibration-password", rounds=rounds)
+    return time.perf_counter() - started_at
+
+
+def bcrypt_cost(hashed_password: str) -> Optional[int]:
+    """Cost factor of a modular-crypt bcrypt hash ($2b$12$...), None if not bcrypt"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2"):
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    """
+    Bounded bcrypt executor
+
+    At most ``max_concurrency`` hashes run at once; callers beyond that wait
+    in a queue of at most ``max_queue`` entries and anything past that is
+    rejected with 503 so login storms shed load instead of piling up.
+    bcrypt releases the GIL, so the default thread pool scales across cores.
+    """
+
+    def __init__(
+        self,
+        executor_kind: str = "thread",
+        workers: int = 4,
+        max_concurrency: int = 4,
+        max_queue: int = 100
+    ):
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rounds: Optional[int] = None
+        self._rehash_tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.waiting = 0
+        self.in_flight = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.calibration_ms: Optional[float] = None
+        self.rehash_scheduled = 0
+        self.rehash_completed = 0
+        self.rehash_failed = 0
+
+    @property
+    def rounds(self) -> int:
+        """Calibrated cost if calibration ran, otherwise BCRYPT_ROUNDS"""
+        return self._rounds or settings.BCRYPT_ROUNDS
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify_password, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.max_queue and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - queued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    async def calibrate(self, target_ms: float, max_rounds: int) -> int:
+        """
+        Pick the highest bcrypt cost whose hash time stays within
+        ``target_ms``, never below BCRYPT_ROUNDS so calibration can only
+        strengthen hashes. Each extra round doubles the work, so one
+        timing at BCRYPT_ROUNDS is enough to extrapolate.
+        """
+        min_rounds = settings.BCRYPT_ROUNDS
+        loop = asyncio.get_running_loop()
+        elapsed = await loop.run_in_executor(self._get_executor(), _time_hash, min_rounds)
+        elapsed_ms = max(elapsed * 1000, 0.001)
+
+        extra = math.floor(math.log2(target_ms / elapsed_ms)) if target_ms > elapsed_ms else 0
+        self._rounds = max(min_rounds, min(max_rounds, min_rounds + extra))
+        self.calibration_ms = round(elapsed_ms * 2 ** (self._rounds - min_rounds), 2)
+        return self._rounds
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        True if a stored bcrypt hash is weaker than the current cost
+
+        Hashes are only ever upgraded, so workers that disagree on the
+        cost never rewrite each other's hashes back and forth.
+        """
+        cost = bcrypt_cost(hashed_password)
+        return cost is not None and cost < self.rounds
+
+    def schedule_rehash(self, user_id: uuid.UUID, password: str, old_hash: str) -> None:
+        """Upgrade a user's hash in the background after a successful login"""
+        task = asyncio.create_task(self._rehash(user_id, password, old_hash))
+        self._rehash_tasks.add(task)
+        task.add_done_callback(self._rehash_tasks.discard)
+        self.rehash_scheduled += 1
+
+    async def _rehash(self, user_id: uuid.UUID, password: str, old_hash: str) -> None:
+        try:
+            new_hash = await self.hash(password)
+            async with AsyncSessionLocal() as db:
+                # Compare-and-swap so a password change made meanwhile wins
+                await db.execute(
+                    update(User)
+                    .where(User.id == user_id)
+                    .where(User.password_hash == old_hash)
+                    .values(password_hash=new_hash)
+                )
+                await db.commit()
+            self.rehash_completed += 1
+        except Exception as e:
+            # The old hash still verifies; the next login retries the upgrade
+            self.rehash_failed += 1
+            logger.warning(f"⚠️ Password rehash failed for user {user_id}: {e}")
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    def shutdown(self) -> None:
+        for task in self._rehash_tasks:
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def metrics(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "rounds": self.rounds,
+            "calibrated": self._rounds is not None,
+            "calibration_ms": self.calibration_ms,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2),
+            "avg_run_ms": round(self.total_run_seconds / completed * 1000, 2),
+            "rehash_scheduled": self.rehash_scheduled,
+            "rehash_completed": self.rehash_completed,
+            "rehash_failed": self.rehash_failed,
+        }
+
+
+# Process-wide hasher instance
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+if __name__ == "__main__":
+    # Print the BCRYPT_ROUNDS to pin in the environment of every worker
+    async def _calibrate() -> None:
+        rounds = await password_hasher.calibrate(settings.BCRYPT_TARGET_MS, settings.BCRYPT_MAX_ROUNDS)
+        print(f"BCRYPT_ROUNDS={rounds}  # ~{password_hasher.calibration_ms}ms per hash on this host")
+        password_hasher.shutdown()
+
+    asyncio.run(_calibrate())
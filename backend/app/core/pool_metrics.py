@@ -0,0 +1,203 @@
+"""
+Connection pool instrumentation and adaptive overflow sizing
+Checkout latency histogram, saturation/overflow/timeout counters, and a
+controller that grows or shrinks max_overflow from observed wait times
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import bisect
+import logging
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.background import BackgroundWorker
+
+logger = logging.getLogger(__name__)
+
+
+# Checkout wait histogram bucket upper bounds, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolStats:
+    """
+    Counters shared by every pool the engine creates
+
+    Kept outside the pool object because engine.dispose() replaces the
+    pool via recreate(), which would otherwise reset the numbers.
+    """
+
+    def __init__(self, sample_size: int = 2048):
+        self.checkouts = 0
+        self.saturated_checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.buckets: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._recent: Deque[float] = deque(maxlen=sample_size)
+        self._peak_overflow = 0
+
+    def record_checkout(self, wait: float, saturated: bool, overflow: int) -> None:
+        self.checkouts += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        self.buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait * 1000)] += 1
+        self._recent.append(wait)
+        if saturated:
+            self.saturated_checkouts += 1
+        if overflow > 0:
+            self.overflow_checkouts += 1
+            self._peak_overflow = max(self._peak_overflow, overflow)
+
+    def record_timeout(self, wait: float) -> None:
+        self.timeouts += 1
+        self._recent.append(wait)
+
+    def drain_window(self):
+        """Recent waits and peak overflow since the last call (for the controller)"""
+        waits, peak = list(self._recent), self._peak_overflow
+        self._recent.clear()
+        self._peak_overflow = 0
+        return waits, peak
+
+    def metrics(self, pool: Pool) -> Dict[str, Any]:
+        waits = sorted(self._recent)
+        metrics: Dict[str, Any] = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "saturated_checkouts": self.saturated_checkouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "timeouts": self.timeouts,
+            "connections_opened": self.connections_opened,
+            "avg_wait_ms": round(self.total_wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            "recent_wait_ms": {
+                "p50": round(_quantile(waits, 0.50) * 1000, 3),
+                "p95": round(_quantile(waits, 0.95) * 1000, 3),
+                "p99": round(_quantile(waits, 0.99) * 1000, 3),
+            },
+            "wait_histogram_ms": {
+                **{f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS_MS, self.buckets)},
+                "le_inf": self.buckets[-1],
+            },
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            metrics.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        return metrics
+
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+# Process-wide pool counters
+pool_stats = PoolStats()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that reports checkout waits to pool_stats"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        # Every pooled and overflow slot is taken: this checkout has to wait
+        saturated = self.checkedout() >= self.size() + max(self._max_overflow, 0)
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout(time.perf_counter() - start)
+            raise
+        pool_stats.record_checkout(time.perf_counter() - start, saturated, self.overflow())
+        return record
+
+    def _create_connection(self):
+        pool_stats.connections_opened += 1
+        return super()._create_connection()
+
+
+class PoolController(BackgroundWorker):
+    """
+    Resizes a QueuePool's max_overflow between ``min_overflow`` and
+    ``max_overflow`` from the checkout waits seen each ``interval``
+
+    If the p95 wait exceeds ``target_wait_ms`` the overflow grows by
+    ``step``; if waits stay under a quarter of the target and the overflow
+    headroom went unused, it shrinks by ``step``. Surplus overflow
+    connections are closed by the pool as they are returned.
+    """
+
+    failure_message = "DB pool controller step failed"
+
+    def __init__(
+        self,
+        get_pool: Callable[[], Pool],
+        min_overflow: int,
+        max_overflow: int,
+        target_wait_ms: float,
+        interval: float,
+        step: int = 2
+    ):
+        super().__init__()
+        self.get_pool = get_pool
+        self.min_overflow = min_overflow
+        self.max_overflow = max(max_overflow, min_overflow)
+        self.target_wait_ms = target_wait_ms
+        self.interval = interval
+        self.step = step
+        self.grows = 0
+        self.shrinks = 0
+
+    def adjust(self) -> Optional[int]:
+        """Run one control step; returns the new max_overflow if it changed"""
+        pool = self.get_pool()
+        if not isinstance(pool, AsyncAdaptedQueuePool):
+            return None
+
+        waits, peak_overflow = pool_stats.drain_window()
+        if not waits:
+            return None
+
+        p95_ms = _quantile(sorted(waits), 0.95) * 1000
+        current = pool._max_overflow
+        target = current
+        if p95_ms > self.target_wait_ms:
+            target = min(self.max_overflow, current + self.step)
+        elif p95_ms < self.target_wait_ms / 4 and peak_overflow <= current - self.step:
+            target = max(self.min_overflow, current - self.step)
+
+        if target == current:
+            return None
+        pool._max_overflow = target
+        if target > current:
+            self.grows += 1
+        else:
+            self.shrinks += 1
+        logger.info(f"🔧 DB pool max_overflow {current} → {target} (p95 wait {p95_ms:.1f}ms)")
+        return target
+
+    async def run_once(self) -> None:
+        self.adjust()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "min_overflow": self.min_overflow,
+            "max_overflow": self.max_overflow,
+            "target_wait_ms": self.target_wait_ms,
+            "interval_seconds": self.interval,
+            "grows": self.grows,
+            "shrinks": self.shrinks,
+        }
@@ -0,0 +1,386 @@
+"""
+Rate limiting for expensive endpoints
+ASGI middleware with pluggable counter backends, keyed by client IP and login email
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Protocol, Tuple
+import asyncio
+import math
+import time
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import orjson
+
+from app.core.auth import get_client_ip
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+
+
+# Bodies larger than this are not parsed for an email key
+MAX_INSPECTED_BODY_BYTES = 64 * 1024
+
+# Longest valid address (RFC 5321); longer strings are not used as keys
+MAX_EMAIL_LENGTH = 254
+
+# Once a store is full, it is trimmed to this fraction of its capacity
+PRUNE_LOW_WATER = 0.9
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of counting one request against a limit"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+
+
+class RateLimitBackend(Protocol):
+    """Counts hits per key; implementations decide the algorithm and storage"""
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        ...
+
+    def size(self) -> int:
+        ...
+
+
+class _LocalBackend(ABC):
+    """
+    Shared bookkeeping for the in-process backends
+
+    Keys are kept in the order they were last hit, so stale keys collect
+    at the front and are popped a few at a time as new hits arrive. Past
+    ``max_keys`` (a flood of distinct keys), the least recently hit keys
+    are dropped down to the low-water mark, so trimming stays amortized
+    O(1) per hit instead of a full scan.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self.low_water = int(max_keys * PRUNE_LOW_WATER)
+        self._state: "OrderedDict[str, Any]" = OrderedDict()
+
+    def size(self) -> int:
+        return len(self._state)
+
+    def _store(self, key: str, state: Any, now: float, window: float) -> None:
+        self._state[key] = state
+        self._state.move_to_end(key)
+        self._prune(now, window)
+
+    def _prune(self, now: float, window: float) -> None:
+        entries = self._state
+        while entries and self._is_stale(next(iter(entries.values())), now, window):
+            entries.popitem(last=False)
+        if len(entries) > self.max_keys:
+            for _ in range(len(entries) - self.low_water):
+                entries.popitem(last=False)
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        ...
+
+    @abstractmethod
+    def _is_stale(self, state: Any, now: float, window: float) -> bool:
+        """Whether a key's state can be dropped without changing its limit"""
+
+
+class SlidingWindowBackend(_LocalBackend):
+    """
+    Sliding-window counter kept in process memory
+
+    Approximates a true sliding log with the current and previous fixed
+    windows, weighting the previous count by how much of it still overlaps
+    the sliding window. O(1) memory per key.
+    """
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.monotonic()
+        index = int(now // window)
+        current_index, current, previous = self._state.get(key, (index, 0, 0))
+
+        if index != current_index:
+            previous = current if index == current_index + 1 else 0
+            current = 0
+
+        elapsed = (now % window) / window
+        estimated = previous * (1 - elapsed) + current
+        if estimated >= limit:
+            self._store(key, (index, current, previous), now, window)
+            if current >= limit:
+                retry_after = window * (1 - elapsed)
+            else:
+                # Wait until enough of the previous window has slid out
+                retry_after = window * (1 - (limit - current) / previous - elapsed)
+            return RateLimitResult(False, limit, 0, max(retry_after, 0.0))
+
+        current += 1
+        self._store(key, (index, current, previous), now, window)
+        return RateLimitResult(True, limit, max(int(limit - estimated - 1), 0), 0.0)
+
+    def _is_stale(self, state: Any, now: float, window: float) -> bool:
+        return state[0] < int(now // window) - 1
+
+
+class TokenBucketBackend(_LocalBackend):
+    """
+    Token bucket kept in process memory
+
+    Each key holds up to ``limit`` tokens refilled at ``limit / window``
+    per second, which allows short bursts while bounding the average rate.
+    """
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.monotonic()
+        rate = limit / window
+        tokens, updated_at = self._state.get(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            self._store(key, (tokens, now), now, window)
+            return RateLimitResult(False, limit, 0, (1 - tokens) / rate)
+
+        self._store(key, (tokens - 1, now), now, window)
+        return RateLimitResult(True, limit, int(tokens - 1), 0.0)
+
+    def _is_stale(self, state: Any, now: float, window: float) -> bool:
+        # A bucket idle for a full window is full again
+        return now - state[1] >= window
+
+
+class CounterStore(Protocol):
+    """
+    Minimal interface of a shared counter store (e.g. Redis INCR + EXPIRE)
+    so every worker and node enforces the same limits
+    """
+
+    async def incr(self, key: str, expire_seconds: float) -> int:
+        """Increment a counter, creating it with the given expiry"""
+        ...
+
+    async def get(self, key: str) -> int:
+        ...
+
+    def size(self) -> int:
+        ...
+
+
+class LocalCounterStore:
+    """
+    In-process stand-in for a shared counter store
+
+    Counters are kept in creation order, which is also expiry order for a
+    single limiter, so expired ones are popped from the front.
+    """
+
+    def __init__(self, max_counters: int = 10000):
+        self.max_counters = max_counters
+        self.low_water = int(max_counters * PRUNE_LOW_WATER)
+        self._counters: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def incr(self, key: str, expire_seconds: float) -> int:
+        now = time.time()
+        async with self._lock:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + expire_seconds
+                self._counters.pop(key, None)
+            count += 1
+            self._counters[key] = (count, expires_at)
+            self._prune(now)
+            return count
+
+    def _prune(self, now: float) -> None:
+        counters = self._counters
+        while counters and next(iter(counters.values()))[1] <= now:
+            counters.popitem(last=False)
+        if len(counters) > self.max_counters:
+            for _ in range(len(counters) - self.low_water):
+                counters.popitem(last=False)
+
+    async def get(self, key: str) -> int:
+        count, expires_at = self._counters.get(key, (0, 0.0))
+        return count if expires_at > time.time() else 0
+
+    def size(self) -> int:
+        return len(self._counters)
+
+
+class SharedStoreBackend:
+    """
+    Sliding-window counter on top of a CounterStore
+
+    Uses wall-clock window indices so all processes agree on windows;
+    counters expire after two windows.
+    """
+
+    def __init__(self, store: CounterStore):
+        self.store = store
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.time()
+        index = int(now // window)
+        previous = await self.store.get(f"{key}:{index - 1}")
+        current = await self.store.incr(f"{key}:{index}", window * 2)
+
+        elapsed = (now % window) / window
+        estimated = previous * (1 - elapsed) + current
+        if estimated > limit:
+            return RateLimitResult(False, limit, 0, window * (1 - elapsed))
+        return RateLimitResult(True, limit, max(int(limit - estimated), 0), 0.0)
+
+    def size(self) -> int:
+        return self.store.size()
+
+
+def create_backend(name: str) -> RateLimitBackend:
+    if name == "token_bucket":
+        return TokenBucketBackend()
+    if name == "shared":
+        return SharedStoreBackend(LocalCounterStore())
+    return SlidingWindowBackend()
+
+
+class RateLimiter:
+    """Limits applied to the protected endpoints, plus counters for /api/metrics"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        ip_limit: int,
+        email_limit: int,
+        window: float,
+        paths: Iterable[str]
+    ):
+        self.backend = backend
+        self.ip_limit = ip_limit
+        self.email_limit = email_limit
+        self.window = window
+        self.paths = frozenset(paths)
+        self.allowed = 0
+        self.limited_ip = 0
+        self.limited_email = 0
+
+    def applies_to(self, scope: Scope) -> bool:
+        return scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in self.paths
+
+    async def check_ip(self, path: str, client_ip: str) -> RateLimitResult:
+        result = await self.backend.hit(f"ip:{path}:{client_ip}", self.ip_limit, self.window)
+        if not result.allowed:
+            self.limited_ip += 1
+        return result
+
+    async def check_email(self, path: str, email: str) -> RateLimitResult:
+        result = await self.backend.hit(f"email:{path}:{email}", self.email_limit, self.window)
+        if not result.allowed:
+            self.limited_email += 1
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "ip_limit": self.ip_limit,
+            "email_limit": self.email_limit,
+            "window_seconds": self.window,
+            "paths": sorted(self.paths),
+            "tracked_keys": self.backend.size(),
+            "allowed": self.allowed,
+            "limited_ip": self.limited_ip,
+            "limited_email": self.limited_email,
+        }
+
+
+def _email_from_body(body: bytes) -> Optional[str]:
+    if not body or len(body) > MAX_INSPECTED_BODY_BYTES:
+        return None
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+    email = data.get("email") if isinstance(data, dict) else None
+    if not isinstance(email, str):
+        return None
+    email = email.strip().lower()
+    return email if 0 < len(email) <= MAX_EMAIL_LENGTH else None
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware that sheds abusive login/register traffic
+    before it reaches password hashing or the database pool
+    """
+
+    def __init__(self, app: ASGIApp, limiter: "RateLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.limiter.applies_to(scope):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        result = await self.limiter.check_ip(path, get_client_ip(Request(scope)))
+        if not result.allowed:
+            await self._reject(result, scope, receive, send)
+            return
+
+        # Buffer the (small) JSON body to key on the email, then replay it
+        body, more_body = b"", True
+        while more_body and len(body) <= MAX_INSPECTED_BODY_BYTES:
+            message = await receive()
+            if message["type"] != "http.request":
+                return  # client disconnected
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        email = _email_from_body(body) if not more_body else None
+        if email:
+            result = await self.limiter.check_email(path, email)
+            if not result.allowed:
+                await self._reject(result, scope, receive, send)
+                return
+
+        self.limiter.allowed += 1
+        buffered: Message = {"type": "http.request", "body": body, "more_body": more_body}
+        await self.app(scope, _replay(buffered, receive), send)
+
+    async def _reject(self, result: RateLimitResult, scope: Scope, receive: Receive, send: Send) -> None:
+        response = FastJSONResponse(
+            {"detail": "Too many requests, please try again later"},
+            status_code=429,
+            headers={
+                "Retry-After": str(max(1, math.ceil(result.retry_after))),
+                "X-RateLimit-Limit": str(result.limit),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+        await response(scope, receive, send)
+
+
+def _replay(first: Message, receive: Receive) -> Receive:
+    """receive() that returns an already-consumed message before the rest of the stream"""
+    pending = [first]
+
+    async def replay_receive() -> Message:
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return replay_receive
+
+
+# Process-wide limiter instance
+rate_limiter = RateLimiter(
+    backend=create_backend(settings.RATE_LIMIT_BACKEND),
+    ip_limit=settings.RATE_LIMIT_REQUESTS,
+    email_limit=settings.RATE_LIMIT_EMAIL_REQUESTS,
+    window=settings.RATE_LIMIT_WINDOW,
+    paths=settings.RATE_LIMIT_PATHS,
+)
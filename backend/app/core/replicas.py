@@ -0,0 +1,191 @@
+"""
+Read-replica routing
+Chooses the engine for read-only sessions and pins recent writers to the primary
+"""
+
+from http.cookies import SimpleCookie
+from typing import Any, Dict, Hashable, List, Optional
+import hashlib
+import hmac
+import itertools
+import math
+import time
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Client-carried primary pin: unix time until which the client's reads
+# must go to the primary, signed so clients cannot extend it. Browsers send
+# the cookie back automatically; other clients echo the response header as
+# a request header.
+PIN_COOKIE = "primary_pin_until"
+PIN_HEADER = "X-Primary-Pin-Until"
+
+
+class ReplicaRouter:
+    """
+    Round-robins read-only sessions across replica engines
+
+    A client that committed a write is pinned to the primary for
+    ``pin_seconds`` so their next reads see it despite replication lag.
+    The pin travels with the client (PIN_COOKIE / PIN_HEADER, set by
+    PrimaryPinMiddleware), so it holds whichever worker or node serves
+    the next request. This process also remembers pins per user, which
+    covers clients that drop the cookie, but only within one process.
+    The window should comfortably exceed the replicas' normal lag.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: List[AsyncEngine],
+        pin_seconds: float,
+        max_pins: int = 100000
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.pin_seconds = pin_seconds
+        self.max_pins = max_pins
+        self._next_replica = itertools.cycle(range(len(replicas)))
+        self._pins: Dict[Hashable, float] = {}
+        self.replica_reads = [0] * len(replicas)
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self.pins = 0
+
+    def pin(self, key: Optional[Hashable]) -> None:
+        """Send ``key``'s reads to the primary for the next pin_seconds"""
+        if key is None or not self.replicas:
+            return
+        now = time.monotonic()
+        if len(self._pins) >= self.max_pins:
+            self._pins = {k: until for k, until in self._pins.items() if until > now}
+        # Re-insert so the dict stays ordered by expiry
+        self._pins.pop(key, None)
+        self._pins[key] = now + self.pin_seconds
+        self.pins += 1
+
+    def is_pinned(self, key: Optional[Hashable]) -> bool:
+        until = self._pins.get(key) if key is not None else None
+        if until is None:
+            return False
+        if until > time.monotonic():
+            return True
+        del self._pins[key]
+        return False
+
+    def read_bind(self, key: Optional[Hashable], client_pin_until: Optional[float] = None) -> Engine:
+        """
+        Engine for a read-only session on behalf of ``key``; ``client_pin_until``
+        is the pin the client sent back, if any
+        """
+        if not self.replicas:
+            self.primary_reads += 1
+            return self.primary.sync_engine
+        if (client_pin_until is not None and client_pin_until > time.time()) or self.is_pinned(key):
+            self.pinned_reads += 1
+            return self.primary.sync_engine
+        index = next(self._next_replica)
+        self.replica_reads[index] += 1
+        return self.replicas[index].sync_engine
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "replicas": [
+                {
+                    "host": replica.url.host,
+                    "reads": reads,
+                    "pool": replica.sync_engine.pool.status(),
+                }
+                for replica, reads in zip(self.replicas, self.replica_reads)
+            ],
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "pin_seconds": self.pin_seconds,
+            "pins": self.pins,
+            "active_pins": len(self._pins),
+        }
+
+
+def pin_key(secret: str) -> bytes:
+    """Pin signing key derived from a server secret (never used directly)"""
+    return hmac.new(secret.encode(), b"primary-pin", hashlib.sha256).digest()
+
+
+def _pin_signature(key: bytes, value: str) -> str:
+    return hmac.new(key, value.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def encode_pin(until: float, key: bytes) -> str:
+    """Signed pin value: <unix time>.<signature>"""
+    value = f"{until:.3f}"
+    return f"{value}.{_pin_signature(key, value)}"
+
+
+def client_pin_until(
+    headers: Any,
+    cookies: Dict[str, str],
+    key: bytes,
+    max_seconds: float
+) -> Optional[float]:
+    """
+    Pin deadline carried by a request, None if absent, malformed or not
+    signed with ``key``; never more than ``max_seconds`` from now
+    """
+    value = headers.get(PIN_HEADER) or cookies.get(PIN_COOKIE)
+    if not value:
+        return None
+    until, _, signature = value.rpartition(".")
+    if not until or not hmac.compare_digest(signature, _pin_signature(key, until)):
+        return None
+    try:
+        until = float(until)
+    except ValueError:
+        return None
+    if not math.isfinite(until):
+        return None
+    return min(until, time.time() + max_seconds)
+
+
+class PrimaryPinMiddleware:
+    """
+    Hands the primary pin to the client after a request that wrote
+
+    The session layer records ``primary_pin_until`` in the request state
+    on commit; this adds it to the response as a cookie and a header.
+    """
+
+    def __init__(self, app: ASGIApp, pin_seconds: float, key: bytes):
+        self.app = app
+        self.pin_seconds = pin_seconds
+        self.key = key
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Share one state dict with the request handlers downstream
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message: Message) -> None:
+            until = state.get("primary_pin_until")
+            if message["type"] == "http.response.start" and until is not None:
+                value = encode_pin(until, self.key)
+                cookie = SimpleCookie()
+                cookie[PIN_COOKIE] = value
+                cookie[PIN_COOKIE]["path"] = "/"
+                cookie[PIN_COOKIE]["max-age"] = math.ceil(self.pin_seconds)
+                cookie[PIN_COOKIE]["httponly"] = True
+                cookie[PIN_COOKIE]["samesite"] = "lax"
+                if scope.get("scheme") == "https":
+                    cookie[PIN_COOKIE]["secure"] = True
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", cookie.output(header="").strip())
+                headers[PIN_HEADER] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,89 @@
+"""
+Fast JSON responses and row streaming
+orjson-based encoding shared by the default response class and streaming endpoints
+"""
+
+from decimal import Decimal
+from ipaddress import IPv4Address, IPv6Address, IPv4Network, IPv6Network
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+import orjson
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+
+# UUID, datetime, date and dict/list (JSONB) values are handled natively by orjson
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not encode natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (IPv4Address, IPv6Address, IPv4Network, IPv6Network)):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to JSON bytes"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """Application-wide JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def _encode_rows(
+    statement,
+    to_row: Callable[[Any], Any],
+    fmt: str,
+    session_info: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[bytes]:
+    """Yield encoded rows as they come off a server-side cursor"""
+    # The request's session may be closed before the body is sent, so the
+    # stream owns its session for as long as the response is being written
+    async with AsyncSessionLocal(info=dict(session_info or {})) as db:
+        result = await db.stream_scalars(
+            statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+        )
+
+        if fmt == "ndjson":
+            async for rows in result.partitions():
+                yield b"".join(dumps(to_row(row)) + b"\n" for row in rows)
+            return
+
+        separator = b"["
+        async for rows in result.partitions():
+            yield separator + b",".join(dumps(to_row(row)) for row in rows)
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+
+
+def stream_rows_response(
+    statement,
+    to_row: Callable[[Any], Any],
+    fmt: str = "ndjson",
+    session_info: Optional[Dict[str, Any]] = None
+) -> StreamingResponse:
+    """
+    Stream every row of an ORM select as NDJSON (one object per line) or
+    as a chunked JSON array, without building the full list in memory.
+    session_info is copied to the stream's session so it is routed like
+    the request's (e.g. to the same read replica).
+    """
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "application/json"
+    return StreamingResponse(
+        _encode_rows(statement, to_row, fmt, session_info),
+        media_type=media_type
+    )
@@ -0,0 +1,227 @@
+"""
+In-memory revocation list for stateless access tokens
+A bloom filter of revoked session IDs, refreshed incrementally from user_sessions
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+import asyncio
+import hashlib
+import logging
+import math
+import time
+import uuid
+
+from sqlalchemy import select
+
+from app.core.background import BackgroundWorker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import UserSession
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over 16-byte keys
+
+    Sized for ``capacity`` items at ``error_rate`` false positives; it never
+    gives false negatives. Bit positions come from double hashing one
+    BLAKE2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, key: bytes) -> bool:
+        """Add a key; returns False if it was (probably) already present"""
+        added = False
+        bits = self._bits
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class RevocationList(BackgroundWorker):
+    """
+    Revoked session IDs for the stateless access-token path
+
+    Every ``refresh_interval`` seconds, sessions revoked since the last
+    watermark are added to the filter; every ``rebuild_interval`` seconds
+    the filter is rebuilt from scratch, which drops sessions whose access
+    tokens have all expired and resizes it if it outgrew its capacity.
+
+    A hit only means "maybe revoked": callers then validate the session
+    against the database, so false positives cost a query, never a login.
+    If the list has not refreshed successfully recently, every session is
+    reported as maybe revoked and auth falls back to the database.
+    """
+
+    # Re-read this much history on each refresh so rows committed late by
+    # long transactions (or stamped by a skewed clock) are not missed
+    OVERLAP = timedelta(seconds=60)
+
+    failure_message = "Revocation list refresh failed"
+
+    def __init__(
+        self,
+        refresh_interval: float,
+        rebuild_interval: float,
+        capacity: int,
+        error_rate: float
+    ):
+        super().__init__()
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._last_success: Optional[float] = None
+        self._last_rebuild: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._rebuilding = False
+        self._added_during_rebuild = []
+        self.refreshes = 0
+        self.rebuilds = 0
+        self.checks = 0
+        self.maybe_revoked = 0
+
+    @property
+    def fresh(self) -> bool:
+        """True while the filter reflects the database closely enough to trust"""
+        if self._last_success is None:
+            return False
+        max_age = max(3 * self.refresh_interval, 30.0)
+        return time.monotonic() - self._last_success <= max_age
+
+    def might_be_revoked(self, session_id: uuid.UUID) -> bool:
+        self.checks += 1
+        if not self.fresh or session_id.bytes in self._filter:
+            self.maybe_revoked += 1
+            return True
+        return False
+
+    def add(self, session_ids: Iterable[uuid.UUID]) -> None:
+        """Revoke sessions in this process immediately (other processes catch up on refresh)"""
+        for session_id in session_ids:
+            self._filter.add(session_id.bytes)
+            if self._rebuilding:
+                self._added_during_rebuild.append(session_id)
+
+    def _horizon(self) -> datetime:
+        # Revocations older than the access-token lifetime cannot matter:
+        # every token minted before them has already expired
+        return datetime.utcnow() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES) - self.OVERLAP
+
+    async def _load_since(self, since: datetime):
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(UserSession.id, UserSession.revoked_at)
+                .where(UserSession.revoked_at > since)
+            )
+            return result.all()
+
+    async def refresh(self) -> int:
+        """Add sessions revoked since the watermark; returns rows read"""
+        async with self._lock:
+            if self._watermark is None:
+                return await self._rebuild()
+
+            rows = await self._load_since(self._watermark - self.OVERLAP)
+            for session_id, revoked_at in rows:
+                self._filter.add(session_id.bytes)
+                if revoked_at > self._watermark:
+                    self._watermark = revoked_at
+
+            self.refreshes += 1
+            self._last_success = time.monotonic()
+            if self._filter.count > self._filter.capacity:
+                await self._rebuild()
+            return len(rows)
+
+    async def rebuild(self) -> int:
+        async with self._lock:
+            return await self._rebuild()
+
+    async def _rebuild(self) -> int:
+        horizon = self._horizon()
+        self._rebuilding = True
+        try:
+            rows = await self._load_since(horizon)
+        finally:
+            self._rebuilding = False
+
+        capacity = max(self._filter.capacity, 2 * len(rows))
+        fresh_filter = BloomFilter(capacity, self.error_rate)
+        watermark = horizon
+        for session_id, revoked_at in rows:
+            fresh_filter.add(session_id.bytes)
+            watermark = max(watermark, revoked_at)
+
+        # Keep local revocations made while the query was running
+        for session_id in self._added_during_rebuild:
+            fresh_filter.add(session_id.bytes)
+        self._added_during_rebuild.clear()
+
+        self._filter = fresh_filter
+        self._watermark = watermark
+        self.rebuilds += 1
+        self._last_success = self._last_rebuild = time.monotonic()
+        return len(rows)
+
+    async def run_once(self) -> None:
+        if self._last_rebuild is None or time.monotonic() - self._last_rebuild >= self.rebuild_interval:
+            await self.rebuild()
+        else:
+            await self.refresh()
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self.refresh_interval)
+
+    def metrics(self) -> Dict[str, Any]:
+        age = None if self._last_success is None else round(time.monotonic() - self._last_success, 2)
+        return {
+            "fresh": self.fresh,
+            "entries": self._filter.count,
+            "capacity": self._filter.capacity,
+            "size_bytes": len(self._filter._bits),
+            "hash_count": self._filter.hash_count,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "last_refresh_age_seconds": age,
+            "refreshes": self.refreshes,
+            "rebuilds": self.rebuilds,
+            "refresh_errors": self.errors,
+            "checks": self.checks,
+            "maybe_revoked": self.maybe_revoked,
+        }
+
+
+# Process-wide revocation list instance
+revocation_list = RevocationList(
+    refresh_interval=settings.REVOCATION_REFRESH_INTERVAL_SECONDS,
+    rebuild_interval=settings.REVOCATION_REBUILD_INTERVAL_SECONDS,
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+)
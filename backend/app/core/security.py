@@ -8,11 +8,11 @@ from typing import Optional, Dict, Any, Tuple
 import hashlib
 import secrets
 
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
 from app.core.config import settings
+from app.core.tokens import token_codec
 
 
 # Password hashing context
@@ -68,12 +68,7 @@ def create_access_token(
         )
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.JWT_SECRET_KEY, 
-        algorithm=settings.JWT_ALGORITHM
-    )
-    return encoded_jwt
+    return token_codec.encode(to_encode)
 
 
 def create_refresh_token(
@@ -94,12 +89,7 @@ def create_refresh_token(
         )
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
-    )
-    return encoded_jwt
+    return token_codec.encode(to_encode)
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
@@ -107,41 +97,20 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     Verify and decode a JWT token
     Returns the token payload if valid, None if invalid
     """
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        
-        # Check token type for refresh tokens
-        if token_type == "refresh":
-            if payload.get("type") != "refresh":
-                return None
-        
-        # Check if token is expired
-        exp = payload.get("exp")
-        if exp is None:
-            return None
-            
-        if datetime.utcnow().timestamp() > exp:
-            return None
-            
-        return payload
-        
-    except JWTError:
-        return None
+    return token_codec.decode(token, token_type)
 
 
 def generate_tokens(
     user_id: str, 
     session_id: str, 
     access_expire_minutes: int = None, 
-    refresh_expire_days: int = None
+    refresh_expire_days: int = None,
+    access_claims: Optional[Dict[str, Any]] = None
 ) -> Tuple[str, str]:
     """
     Generate both access and refresh tokens for a user session
     Returns tuple of (access_token, refresh_token)
+    access_claims are added to the access token only
     """
     # Use provided expiration times or defaults
     if access_expire_minutes is None:
@@ -153,6 +122,7 @@ def generate_tokens(
     access_token_expires = timedelta(minutes=access_expire_minutes)
     access_token = create_access_token(
         data={
+            **(access_claims or {}),
             "user_id": str(user_id),
             "session_id": str(session_id),
             "type": "access"
@@ -166,7 +136,8 @@ def generate_tokens(
         data={
             "user_id": str(user_id),
             "session_id": str(session_id),
-            "type": "refresh"
+            "type": "refresh",
+            "jti": secrets.token_urlsafe(8)
         }, 
         expires_delta=refresh_token_expires
     )
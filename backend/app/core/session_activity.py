@@ -0,0 +1,184 @@
+"""
+Write-behind batching of session activity timestamps
+Coalesces UserSession.last_used_at updates into periodic bulk UPDATEs
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.background import BackgroundWorker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import UserSession
+
+logger = logging.getLogger(__name__)
+
+
+# asyncpg binds at most 32767 parameters per statement (two per row here)
+MAX_ROWS_PER_STATEMENT = 16000
+
+
+class SessionActivityWriter(BackgroundWorker):
+    """
+    Collects last-used timestamps in memory and flushes them in bulk
+
+    Only the newest timestamp per session is kept, so a hot session costs
+    one row in each flush no matter how many requests it served. A flush
+    runs every ``flush_interval`` seconds or as soon as ``max_pending``
+    sessions are waiting, and writes at most ``max_pending`` rows per
+    statement. While the database is unreachable at most ``max_buffered``
+    timestamps are held for retry; beyond that the oldest are dropped,
+    which only loses last-activity precision.
+    """
+
+    failure_message = "Session activity flush loop failed"
+
+    def __init__(self, flush_interval: float, max_pending: int, max_buffered: int):
+        super().__init__()
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.chunk_size = max(1, min(max_pending, MAX_ROWS_PER_STATEMENT))
+        self.max_buffered = max(max_buffered, max_pending)
+        self._pending: Dict[uuid.UUID, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.touches = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._last_flush_failed = False
+
+    def touch(self, session_id: uuid.UUID, used_at: Optional[datetime] = None) -> None:
+        """Record session activity without touching the database"""
+        used_at = used_at or datetime.utcnow()
+        previous = self._pending.get(session_id)
+        if previous is None:
+            if len(self._pending) >= self.max_buffered:
+                # Evict the earliest-added session rather than grow without bound
+                del self._pending[next(iter(self._pending))]
+                self.dropped += 1
+            self._pending[session_id] = used_at
+        elif used_at > previous:
+            self._pending[session_id] = used_at
+        self.touches += 1
+
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    def _statement(self, rows: List[Tuple[uuid.UUID, datetime]]):
+        activity = values(
+            column("id", UUID(as_uuid=True)),
+            column("last_used_at", DateTime()),
+            name="activity",
+        ).data(rows)
+
+        return (
+            update(UserSession)
+            .where(UserSession.id == activity.c.id)
+            .where(or_(
+                UserSession.last_used_at.is_(None),
+                UserSession.last_used_at < activity.c.last_used_at,
+            ))
+            .values(last_used_at=activity.c.last_used_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _requeue(self, rows: List[Tuple[uuid.UUID, datetime]]) -> None:
+        """Put unwritten rows back for the next flush, keeping the newest max_buffered"""
+        for session_id, used_at in rows:
+            newer = self._pending.get(session_id)
+            if newer is None or newer < used_at:
+                self._pending[session_id] = used_at
+
+        overflow = len(self._pending) - self.max_buffered
+        if overflow > 0:
+            kept = sorted(self._pending.items(), key=lambda item: item[1])[overflow:]
+            self._pending = dict(kept)
+            self.dropped += overflow
+
+    async def flush(self) -> int:
+        """Write all pending timestamps as UPDATE ... FROM (VALUES ...) chunks"""
+        async with self._flush_lock:
+            if self.dropped > self._dropped_reported:
+                logger.warning(
+                    f"⚠️ Dropped {self.dropped - self._dropped_reported} buffered session "
+                    f"activity timestamps (buffer limit {self.max_buffered})"
+                )
+                self._dropped_reported = self.dropped
+
+            if not self._pending:
+                return 0
+
+            rows, self._pending = list(self._pending.items()), {}
+            written = 0
+            for offset in range(0, len(rows), self.chunk_size):
+                chunk = rows[offset:offset + self.chunk_size]
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(self._statement(chunk))
+                        await db.commit()
+                except Exception as e:
+                    # Keep this chunk and the rest for the next flush
+                    self.flush_errors += 1
+                    self._last_flush_failed = True
+                    self._requeue(rows[offset:])
+                    logger.warning(f"⚠️ Session activity flush failed: {e}")
+                    return written
+                except BaseException:
+                    # Cancelled mid-write (shutdown): the final flush in stop() retries
+                    # these; rewriting a chunk that did commit is harmless
+                    self._requeue(rows[offset:])
+                    raise
+                written += len(chunk)
+                self.rows_written += len(chunk)
+
+            self._last_flush_failed = False
+            self.flushes += 1
+            return written
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still pending"""
+        await super().stop()
+        await self.flush()
+
+    async def run_once(self) -> None:
+        await self.flush()
+
+    async def wait(self) -> None:
+        if self._last_flush_failed:
+            # Back off instead of retrying on every full buffer
+            await asyncio.sleep(self.flush_interval)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "touches": self.touches,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "flush_errors": self.flush_errors,
+            "dropped": self.dropped,
+            "flush_interval_seconds": self.flush_interval,
+            "max_pending": self.max_pending,
+            "max_buffered": self.max_buffered,
+        }
+
+
+# Process-wide writer instance
+session_activity_writer = SessionActivityWriter(
+    flush_interval=settings.SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.SESSION_ACTIVITY_FLUSH_MAX_PENDING,
+    max_buffered=settings.SESSION_ACTIVITY_MAX_BUFFERED,
+)
@@ -0,0 +1,208 @@
+"""
+In-process cache of validated authentication sessions
+TTL + LRU store used by get_current_user to skip database lookups
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+import time
+import uuid
+
+from app.core.config import settings
+from app.models.user import User, UserSession
+
+
+# Columns copied into cache snapshots (password hash is never cached)
+SESSION_SNAPSHOT_FIELDS = (
+    "id", "user_id", "ip_address", "user_agent", "device_info",
+    "created_at", "expires_at", "last_used_at", "is_active",
+)
+USER_SNAPSHOT_FIELDS = (
+    "id", "email", "first_name", "last_name", "phone_number", "avatar",
+    "email_verified", "email_verified_at", "language", "timezone",
+    "notification_preferences", "privacy_settings",
+    "created_at", "updated_at", "last_login_at",
+)
+
+
+# User snapshot columns holding datetimes (ISO strings inside token claims)
+_USER_DATETIME_FIELDS = ("email_verified_at", "created_at", "updated_at", "last_login_at")
+
+
+def build_auth_models(session: Dict[str, Any], user: Dict[str, Any]):
+    """Build fresh, detached ORM instances from session and user snapshots"""
+    return UserSession(**session), User(**user)
+
+
+def snapshot_claims(user: Dict[str, Any], session_expires_at: datetime) -> Dict[str, Any]:
+    """Access-token claims carrying a user snapshot for stateless validation"""
+    claims = {}
+    for name in USER_SNAPSHOT_FIELDS:
+        value = user.get(name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        claims[name] = value
+    return {"usr": claims, "sxp": session_expires_at.isoformat()}
+
+
+def models_from_claims(payload: Dict[str, Any], session_id: uuid.UUID):
+    """Rebuild detached session and user instances from snapshot claims"""
+    user = dict(payload["usr"])
+    user["id"] = uuid.UUID(user["id"])
+    for name in _USER_DATETIME_FIELDS:
+        if user.get(name):
+            user[name] = datetime.fromisoformat(user[name])
+    session = {
+        "id": session_id,
+        "user_id": user["id"],
+        "expires_at": datetime.fromisoformat(payload["sxp"]),
+        "is_active": True,
+    }
+    return build_auth_models(session, user)
+
+
+@dataclass
+class CachedAuthEntry:
+    """Validated session and user snapshots with their cache deadline"""
+    session: Dict[str, Any]
+    user: Dict[str, Any]
+    expires_at: float
+
+    def to_models(self):
+        """Build fresh, detached ORM instances for the current request"""
+        return build_auth_models(self.session, self.user)
+
+
+@dataclass
+class CacheStats:
+    """Cache counters exposed through the metrics endpoint"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class SessionCache:
+    """
+    TTL + LRU cache keyed by session ID
+
+    Entries never outlive the session's own expires_at. Invalidation is
+    local to the process, so the TTL bounds how long another worker can
+    keep serving a session that was logged out elsewhere.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[uuid.UUID, CachedAuthEntry]" = OrderedDict()
+        self._user_sessions: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+
+    def get(self, session_id: uuid.UUID) -> Optional[CachedAuthEntry]:
+        """Return a live entry and mark it as recently used"""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(session_id)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(session_id)
+        self.stats.hits += 1
+        return entry
+
+    def put(self, session: Dict[str, Any], user: Dict[str, Any]) -> None:
+        """Store validated snapshots, evicting the least recently used entry"""
+        if not self.enabled:
+            return
+
+        ttl = self.ttl_seconds
+        session_expires_at = session.get("expires_at")
+        if isinstance(session_expires_at, datetime):
+            remaining = (session_expires_at - datetime.utcnow()).total_seconds()
+            ttl = min(ttl, remaining)
+        if ttl <= 0:
+            return
+
+        session_id = session["id"]
+        user_id = user["id"]
+        if session_id in self._entries:
+            self._remove(session_id)
+
+        self._entries[session_id] = CachedAuthEntry(
+            session=session,
+            user=user,
+            expires_at=time.monotonic() + ttl,
+        )
+        self._user_sessions.setdefault(user_id, set()).add(session_id)
+
+        while len(self._entries) > self.max_entries:
+            oldest_id = next(iter(self._entries))
+            self._remove(oldest_id)
+            self.stats.evictions += 1
+
+    def invalidate(self, session_id: uuid.UUID) -> None:
+        """Drop a single session (logout, token refresh)"""
+        if self._remove(session_id):
+            self.stats.invalidations += 1
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop every cached session belonging to a user"""
+        for session_id in list(self._user_sessions.get(user_id, ())):
+            self.invalidate(session_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._user_sessions.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **self.stats.as_dict(),
+        }
+
+    def _remove(self, session_id: uuid.UUID) -> bool:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+
+        user_id = entry.user["id"]
+        sessions = self._user_sessions.get(user_id)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._user_sessions[user_id]
+        return True
+
+
+# Process-wide cache instance
+session_cache = SessionCache(
+    max_entries=settings.AUTH_SESSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_SESSION_CACHE_TTL_SECONDS,
+    enabled=settings.AUTH_SESSION_CACHE_ENABLED,
+)
@@ -0,0 +1,122 @@
+"""
+Background housekeeping of the user_sessions table
+Deletes (or archives) expired and revoked sessions in bounded batches
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import logging
+
+from sqlalchemy import delete, insert, or_, select
+
+from app.core.background import BackgroundWorker
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import UserSession, UserSessionArchive
+
+logger = logging.getLogger(__name__)
+
+
+# Columns copied into user_sessions_archive
+ARCHIVE_COLUMNS = [column.name for column in UserSession.__table__.columns]
+
+
+class SessionHousekeeper(BackgroundWorker):
+    """
+    Periodically removes sessions that expired or were revoked more than
+    ``retention`` ago
+
+    Each batch picks at most ``batch_size`` rows with FOR UPDATE SKIP
+    LOCKED, so several workers can run the job at once without blocking
+    each other or the auth path, and each batch commits on its own so no
+    transaction holds many row locks. A run stops after ``max_batches``
+    and picks up again on the next interval.
+    """
+
+    failure_message = "Session housekeeping failed"
+
+    def __init__(
+        self,
+        interval: float,
+        batch_size: int,
+        max_batches: int,
+        retention: timedelta,
+        archive: bool = False
+    ):
+        super().__init__()
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.retention = retention
+        self.archive = archive
+        self.runs = 0
+        self.rows_removed = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_removed = 0
+
+    def _batch_statement(self, cutoff: datetime):
+        doomed = (
+            select(UserSession.id)
+            .where(or_(
+                UserSession.expires_at < cutoff,
+                UserSession.revoked_at < cutoff,
+            ))
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        removed = delete(UserSession).where(UserSession.id.in_(doomed.scalar_subquery()))
+
+        if not self.archive:
+            return removed.execution_options(synchronize_session=False)
+
+        moved = removed.returning(
+            *(UserSession.__table__.c[name] for name in ARCHIVE_COLUMNS)
+        ).cte("moved")
+        return insert(UserSessionArchive).from_select(ARCHIVE_COLUMNS, select(moved))
+
+    async def run_once(self) -> int:
+        """Remove eligible sessions batch by batch; returns rows removed"""
+        # Revoked sessions must outlive the access tokens minted for them,
+        # or the stateless revocation filter would lose track of them
+        retention = max(self.retention, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+        cutoff = datetime.utcnow() - retention
+        statement = self._batch_statement(cutoff)
+
+        removed = 0
+        for _ in range(self.max_batches):
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(statement)
+                await db.commit()
+            removed += result.rowcount
+            if result.rowcount < self.batch_size:
+                break
+
+        self.runs += 1
+        self.rows_removed += removed
+        self.last_run_at = datetime.utcnow()
+        self.last_run_removed = removed
+        if removed:
+            logger.info(f"🧹 Removed {removed} expired or revoked sessions")
+        return removed
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "archive": self.archive,
+            "runs": self.runs,
+            "rows_removed": self.rows_removed,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at.isoformat() + "Z" if self.last_run_at else None,
+            "last_run_removed": self.last_run_removed,
+        }
+
+
+# Process-wide housekeeper instance
+session_housekeeper = SessionHousekeeper(
+    interval=settings.SESSION_HOUSEKEEPING_INTERVAL_SECONDS,
+    batch_size=settings.SESSION_HOUSEKEEPING_BATCH_SIZE,
+    max_batches=settings.SESSION_HOUSEKEEPING_MAX_BATCHES,
+    retention=timedelta(hours=settings.SESSION_RETENTION_HOURS),
+    archive=settings.SESSION_ARCHIVE_ENABLED,
+)
@@ -0,0 +1,203 @@
+"""
+JWT token codec
+Prepares the signing keys once and verifies tokens in a single pass, with an
+optional LRU of recently decoded payloads keyed by the token hash
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import calendar
+import hashlib
+import logging
+import time
+
+from jose import JWSError, jwk, jws
+import orjson
+
+from app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+def derive_kid(secret: str) -> str:
+    """Stable key id for a secret that was configured without one"""
+    return hashlib.sha256(secret.encode()).hexdigest()[:8]
+
+
+def load_keyring(config: Settings) -> Tuple[Dict[str, str], str, Optional[str], bool]:
+    """
+    Read the signing keys from settings
+
+    Returns (keys by kid, active kid, legacy secret, pinned). The legacy
+    secret verifies tokens issued before kid headers existed. ``pinned`` is
+    False when the only key is the per-process random default, which breaks
+    as soon as more than one worker signs tokens.
+    """
+    secret_pinned = "JWT_SECRET_KEY" in config.model_fields_set
+    keys: Dict[str, str] = {}
+    for entry in config.JWT_SIGNING_KEYS.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        kid, separator, secret = entry.partition(":")
+        if not separator or not kid or not secret:
+            raise ValueError("JWT_SIGNING_KEYS entries must look like 'kid:secret'")
+        keys[kid] = secret
+
+    if not keys:
+        kid = derive_kid(config.JWT_SECRET_KEY)
+        return {kid: config.JWT_SECRET_KEY}, kid, config.JWT_SECRET_KEY, secret_pinned
+
+    active_kid = config.JWT_ACTIVE_KID or next(iter(keys))
+    if active_kid not in keys:
+        raise ValueError(f"JWT_ACTIVE_KID '{active_kid}' is not in JWT_SIGNING_KEYS")
+    legacy_secret = config.JWT_SECRET_KEY if secret_pinned else None
+    return keys, active_kid, legacy_secret, True
+
+
+class TokenCodec:
+    """
+    Encoder/decoder for the API's HS* JWTs
+
+    python-jose's jwt.encode/jwt.decode rebuild the key from the secret
+    string and run the full registered-claims validation on every call.
+    The codec constructs its keys once, checks the signature with
+    jws.verify and then validates only the claims the API issues (exp and
+    type). Decoded payloads are cached by SHA-256 of the token until they
+    expire, so repeated requests with the same bearer token skip the HMAC
+    and JSON work entirely. Returned payloads are shared; treat them as
+    read-only.
+
+    Tokens are signed with the active key and carry its ``kid`` header;
+    verification uses whichever key the header names, so retired keys keep
+    validating until they are removed from the keyring.
+    """
+
+    def __init__(
+        self,
+        keys: Dict[str, str],
+        active_kid: str,
+        algorithm: str,
+        cache_size: int = 1024,
+        legacy_secret: Optional[str] = None,
+        pinned: bool = True
+    ):
+        self.algorithm = algorithm
+        self._algorithms = [algorithm]
+        self.active_kid = active_kid
+        self.pinned = pinned
+        self._keys = {kid: jwk.construct(secret, algorithm) for kid, secret in keys.items()}
+        self._key = self._keys[active_kid]
+        self._headers = {"kid": active_kid}
+        self._legacy_key = jwk.construct(legacy_secret, algorithm) if legacy_secret else None
+        # Encoded header segment -> key, so known headers skip header parsing
+        self._keys_by_header = {
+            jws.sign(b"{}", key, headers={"kid": kid}, algorithm=algorithm).split(".", 1)[0]: key
+            for kid, key in self._keys.items()
+        }
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Sign claims; a datetime exp is converted to a UTC timestamp"""
+        exp = claims.get("exp")
+        if isinstance(exp, datetime):
+            claims = {**claims, "exp": calendar.timegm(exp.utctimetuple())}
+        return jws.sign(orjson.dumps(claims), self._key, headers=self._headers, algorithm=self.algorithm)
+
+    def _verification_key(self, token: str):
+        key = self._keys_by_header.get(token.partition(".")[0])
+        if key is not None:
+            return key
+        kid = jws.get_unverified_header(token).get("kid")
+        if kid is None:
+            return self._legacy_key
+        return self._keys.get(kid)
+
+    def decode(self, token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+        """Return the payload of a valid, unexpired token, None otherwise"""
+        now = time.time()
+        cache_key = hashlib.sha256(token.encode()).digest() if self.cache_size else None
+
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                payload, exp = cached
+                if now <= exp:
+                    self._cache.move_to_end(cache_key)
+                    self.hits += 1
+                    return self._check_type(payload, token_type)
+                del self._cache[cache_key]
+            self.misses += 1
+
+        try:
+            key = self._verification_key(token)
+            if key is None:
+                self.rejected += 1
+                return None
+            payload = orjson.loads(jws.verify(token, key, self._algorithms))
+        except (JWSError, orjson.JSONDecodeError):
+            self.rejected += 1
+            return None
+
+        exp = payload.get("exp") if isinstance(payload, dict) else None
+        if not isinstance(exp, (int, float)) or now > exp:
+            self.rejected += 1
+            return None
+
+        if cache_key is not None:
+            self._cache[cache_key] = (payload, exp)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return self._check_type(payload, token_type)
+
+    @staticmethod
+    def _check_type(payload: Dict[str, Any], token_type: str) -> Optional[Dict[str, Any]]:
+        # Matches the historical rule: only refresh tokens are type-checked
+        if token_type == "refresh" and payload.get("type") != "refresh":
+            return None
+        return payload
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "algorithm": self.algorithm,
+            "active_kid": self.active_kid,
+            "kids": list(self._keys),
+            "keyring_pinned": self.pinned,
+            "cache_size": self.cache_size,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_token_codec(config: Settings) -> TokenCodec:
+    keys, active_kid, legacy_secret, pinned = load_keyring(config)
+    if not pinned:
+        logger.warning(
+            "⚠️ JWT signing key is generated per process; set JWT_SIGNING_KEYS "
+            "or JWT_SECRET_KEY so every worker accepts the same tokens"
+        )
+    return TokenCodec(
+        keys,
+        active_kid,
+        config.JWT_ALGORITHM,
+        config.JWT_DECODE_CACHE_SIZE,
+        legacy_secret=legacy_secret,
+        pinned=pinned,
+    )
+
+
+# Process-wide codec instance, keyring loaded once at import
+token_codec = build_token_codec(settings)
@@ -0,0 +1,31 @@
+"""
+Vietnamese text normalization
+Diacritic-insensitive forms shared by profile writes and search queries
+"""
+
+from typing import Optional
+import unicodedata
+
+
+# đ/Đ are distinct letters, not a base letter plus a combining mark
+_LETTER_MAP = str.maketrans({"đ": "d", "Đ": "D"})
+
+
+def normalize_vietnamese(text: Optional[str]) -> str:
+    """
+    Lowercase, strip diacritics and collapse whitespace
+    "Nguyễn  Văn Đức" -> "nguyen van duc"
+    """
+    if not text:
+        return ""
+
+    decomposed = unicodedata.normalize("NFD", text.translate(_LETTER_MAP))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().split())
+
+
+def build_search_name(*names: Optional[str]) -> Optional[str]:
+    """Combine several name fields into one normalized search string"""
+    normalized = [normalize_vietnamese(name) for name in names]
+    combined = " ".join(name for name in normalized if name)
+    return combined or None
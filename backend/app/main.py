@@ -3,21 +3,98 @@ Trang Vien So - FastAPI Backend Application
 Vietnamese Memorial App API Server
 """
 
-from fastapi import FastAPI, Request, Response
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-import time
 import logging
 from datetime import datetime
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, close_db, pool_controller, primary_pin_key
+from app.core.responses import FastJSONResponse
+from app.core.session_activity import session_activity_writer
+from app.core.password_hashing import password_hasher
+from app.core.tokens import token_codec
+from app.core.revocation import revocation_list
+from app.core.session_housekeeping import session_housekeeper
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.middleware import InstrumentationMiddleware
+from app.core.replicas import PIN_HEADER, PrimaryPinMiddleware
+from app.core.health_probe import health_prober
 from app.routers import auth, users, health, deceased
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Startup and shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database connection and background tasks around the app's lifetime"""
+    logger.info("🚀 Starting Trang Vien So API Server...")
+    logger.info(f"📚 Environment: {settings.ENVIRONMENT}")
+    logger.info(f"🔗 Database URL: {settings.DATABASE_URL[:50]}...")
+    
+    # Every worker must share the JWT keyring in production
+    if settings.ENVIRONMENT == "production" and not token_codec.pinned:
+        raise RuntimeError("JWT_SIGNING_KEYS or JWT_SECRET_KEY must be set in production")
+    logger.info(f"🔑 JWT keyring loaded (active kid: {token_codec.active_kid})")
+    
+    # Initialize database (skip for testing if DB not available)
+    try:
+        await init_db()
+        logger.info("✅ Database connection established")
+    except Exception as e:
+        logger.warning(f"⚠️ Database connection failed (testing mode): {e}")
+        logger.info("🔄 Continuing without database for basic testing")
+    
+    # Tune the bcrypt cost to this host
+    if settings.BCRYPT_CALIBRATE_ON_STARTUP:
+        rounds = await password_hasher.calibrate(
+            settings.BCRYPT_TARGET_MS,
+            settings.BCRYPT_MAX_ROUNDS
+        )
+        logger.info(f"🔐 bcrypt rounds calibrated to {rounds} (~{password_hasher.calibration_ms}ms)")
+    
+    # Cached health status for /api/health and the readiness probe
+    health_prober.start()
+    if settings.HEALTH_DRAIN_SECONDS > 0:
+        health_prober.drain_on_sigterm(settings.HEALTH_DRAIN_SECONDS)
+    
+    # Grow or shrink the connection pool's overflow with checkout waits
+    if settings.DATABASE_POOL_ADAPTIVE:
+        pool_controller.start()
+    
+    # Start write-behind flushing of session activity
+    session_activity_writer.start()
+    
+    # Keep the access-token revocation filter in sync with user_sessions
+    if settings.AUTH_STATELESS_TOKENS:
+        revocation_list.start()
+    
+    # Remove expired and revoked sessions in the background
+    if settings.SESSION_HOUSEKEEPING_ENABLED:
+        session_housekeeper.start()
+    
+    yield
+    
+    logger.info("🛑 Shutting down Trang Vien So API Server...")
+    
+    # Fail readiness (already failing since SIGTERM when HEALTH_DRAIN_SECONDS > 0)
+    health_prober.drain()
+    await health_prober.stop()
+    await session_housekeeper.stop()
+    await revocation_list.stop()
+    await pool_controller.stop()
+    
+    # Flush pending session activity before the process exits
+    await session_activity_writer.stop()
+    
+    # Release password hashing workers and database connections
+    password_hasher.shutdown()
+    await close_db()
+
 # Create FastAPI application
 app = FastAPI(
     title="Trang Vien So API",
@@ -25,6 +102,8 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/api/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/api/redoc" if settings.ENVIRONMENT == "development" else None,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Security middleware
@@ -34,6 +113,18 @@ if settings.ENVIRONMENT == "production":
         allowed_hosts=["localhost", "127.0.0.1", "*.example.com"]
     )
 
+# Rate limiting of expensive auth endpoints (inside CORS so 429s carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# Read-your-writes: hand clients that wrote a primary pin for their next reads
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(
+        PrimaryPinMiddleware,
+        pin_seconds=settings.DATABASE_PRIMARY_PIN_SECONDS,
+        key=primary_pin_key,
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -41,61 +132,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[PIN_HEADER],
 )
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to all responses"""
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    response.headers["X-API-Version"] = "2.0.0"
-    return response
-
-# Request logging middleware  
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests"""
-    start_time = time.perf_counter()
-    
-    # Log request
-    logger.info(f"📥 {request.method} {request.url.path} - {request.client.host}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.perf_counter() - start_time
-    logger.info(
-        f"📤 {request.method} {request.url.path} - "
-        f"Status: {response.status_code} - "
-        f"Time: {process_time:.4f}s"
-    )
-    
-    return response
-
-# Database initialization
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connection on startup"""
-    logger.info("🚀 Starting Trang Vien So API Server...")
-    logger.info(f"📚 Environment: {settings.ENVIRONMENT}")
-    logger.info(f"🔗 Database URL: {settings.DATABASE_URL[:50]}...")
-    
-    # Initialize database (skip for testing if DB not available)
-    try:
-        await init_db()
-        logger.info("✅ Database connection established")
-    except Exception as e:
-        logger.warning(f"⚠️ Database connection failed (testing mode): {e}")
-        logger.info("🔄 Continuing without database for basic testing")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("🛑 Shutting down Trang Vien So API Server...")
+# Timing headers and access logging (outermost, so it times the whole stack)
+app.add_middleware(
+    InstrumentationMiddleware,
+    api_version="2.0.0",
+    access_log=settings.ENABLE_ACCESS_LOG,
+)
 
 # Include routers
 app.include_router(health.router, tags=["health"])
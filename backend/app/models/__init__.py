@@ -3,7 +3,7 @@ Database models for Trang Vien So API
 SQLAlchemy models matching PostgreSQL schema
 """
 
-from .user import User, UserSession
+from .user import User, UserSession, UserSessionArchive
 from .deceased import DeceasedProfile
 from .family import Family, FamilyMember, Invitation
 from .media import MediaFile
@@ -11,6 +11,7 @@ from .media import MediaFile
 __all__ = [
     "User",
     "UserSession", 
+    "UserSessionArchive",
     "DeceasedProfile",
     "Family",
     "FamilyMember",
@@ -3,13 +3,15 @@ Deceased profile models
 Memorial and tribute management
 """
 
-from sqlalchemy import Column, String, Text, Date, Integer, ForeignKey, CheckConstraint, ARRAY, DateTime
+from sqlalchemy import Column, String, Text, Date, Integer, ForeignKey, CheckConstraint, ARRAY, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy import event
 import uuid
 
 from app.core.database import Base
+from app.core.vietnamese import build_search_name
 
 
 class DeceasedProfile(Base):
@@ -83,7 +85,9 @@ class DeceasedProfile(Base):
     
     # Statistics
     view_count = Column(Integer, default=0)
-    search_vector = Column(TSVECTOR)
+    # Search columns are only used inside SQL, so they are never loaded by default
+    search_vector = deferred(Column(TSVECTOR))  # Maintained by trigger, see migrations/add_deceased_full_text_search.sql
+    search_name = deferred(Column(Text))  # Unaccented, lowercased names; set on every write
     
     # Constraints
     __table_args__ = (
@@ -103,6 +107,15 @@ class DeceasedProfile(Base):
             "death_date IS NULL OR birth_date IS NULL OR death_date >= birth_date",
             name="valid_schema_dates"
         ),
+        # Keyset pagination on (created_at, id), newest first
+        Index("idx_deceased_profiles_created_at_id", created_at.desc(), id.desc()),
+        # Full-text search; search_vector is maintained by a database trigger
+        Index("idx_deceased_profiles_search_vector", search_vector, postgresql_using="gin"),
+        # Diacritic-insensitive prefix/fuzzy name lookups (pg_trgm)
+        Index(
+            "idx_deceased_profiles_search_name_trgm", search_name,
+            postgresql_using="gin", postgresql_ops={"search_name": "gin_trgm_ops"}
+        ),
     )
     
     # Relationships
@@ -137,4 +150,13 @@ class DeceasedProfile(Base):
             return f"{self.vietnamese_name} ({self.common_name})"
         elif self.nickname and self.first_name and self.last_name:
             return f"{self.first_name} '{self.nickname}' {self.last_name}"
-        return self.full_name
\ No newline at end of file
+        return self.full_name
+
+
+@event.listens_for(DeceasedProfile, "before_insert")
+@event.listens_for(DeceasedProfile, "before_update")
+def _set_search_name(mapper, connection, target):
+    """Keep search_name in sync with the name fields it is built from"""
+    target.search_name = build_search_name(
+        target.vietnamese_name, target.common_name, target.english_name
+    )
@@ -3,7 +3,7 @@ User and UserSession models
 Authentication and user management
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -81,6 +81,8 @@ class UserSession(Base):
     # Token information
     token_hash = Column(String(255), unique=True, nullable=False)
     refresh_token_hash = Column(String(255))
+    previous_refresh_token_hash = Column(String(255))
+    refresh_rotated_at = Column(DateTime(timezone=False))
     
     # Session metadata
     ip_address = Column(INET)
@@ -92,9 +94,49 @@ class UserSession(Base):
     expires_at = Column(DateTime(timezone=False), nullable=False)
     last_used_at = Column(DateTime(timezone=False), server_default=func.now())
     is_active = Column(Boolean, default=True, index=True)
+    revoked_at = Column(DateTime(timezone=False))  # also stamped by a trigger when is_active flips
+    
+    __table_args__ = (
+        # Incremental loading of the access-token revocation filter
+        Index(
+            "idx_user_sessions_revoked_at", revoked_at,
+            postgresql_where=revoked_at.isnot(None)
+        ),
+        # Auth lookups by id only ever want active sessions
+        Index("idx_user_sessions_active_id", id, postgresql_where=is_active),
+        # logout_all_sessions and /api/auth/sessions
+        Index("idx_user_sessions_user_active_expires", user_id, is_active, expires_at),
+        # Housekeeping deletes expired sessions in expiry order
+        Index("idx_user_sessions_expires_at", expires_at),
+    )
     
     # Relationships
     user = relationship("User", back_populates="sessions")
     
     def __repr__(self):
-        return f"<UserSession(id={self.id}, user_id={self.user_id}, active={self.is_active})>"
\ No newline at end of file
+        return f"<UserSession(id={self.id}, user_id={self.user_id}, active={self.is_active})>"
+
+
+class UserSessionArchive(Base):
+    """Expired and revoked sessions moved out of user_sessions by housekeeping"""
+    
+    __tablename__ = "user_sessions_archive"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash = Column(String(255), nullable=False)
+    refresh_token_hash = Column(String(255))
+    previous_refresh_token_hash = Column(String(255))
+    refresh_rotated_at = Column(DateTime(timezone=False))
+    ip_address = Column(INET)
+    user_agent = Column(Text)
+    device_info = Column(JSONB)
+    created_at = Column(DateTime(timezone=False))
+    expires_at = Column(DateTime(timezone=False), nullable=False)
+    last_used_at = Column(DateTime(timezone=False))
+    is_active = Column(Boolean)
+    revoked_at = Column(DateTime(timezone=False))
+    archived_at = Column(DateTime(timezone=False), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<UserSessionArchive(id={self.id}, user_id={self.user_id})>"
@@ -3,15 +3,17 @@ Authentication router
 User registration, login, logout, and token management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.core.database import get_db
 from app.core.auth import get_current_user, get_current_session, get_client_ip, get_user_agent
+from app.core.responses import stream_rows_response
 from app.services.auth_service import AuthService
 from app.schemas.user import UserRegisterRequest, UserLoginRequest, UserResponse
 from app.schemas.auth import LoginResponse, TokenResponse, RefreshTokenRequest, LogoutResponse
+from app.schemas.serializers import user_serializer
 from app.models.user import User, UserSession
 
 
@@ -175,7 +177,7 @@ async def get_current_user_info(
     
     Returns the profile information of the authenticated user.
     """
-    return UserResponse.from_orm(current_user)
+    return user_serializer.to_model(current_user)
 
 
 @router.get("/verify-token")
@@ -197,8 +199,23 @@ async def verify_token(
     }
 
 
+def _session_row(session: UserSession) -> Dict[str, Any]:
+    """Public representation of a user session"""
+    return {
+        "id": session.id,
+        "ip_address": session.ip_address,
+        "user_agent": session.user_agent,
+        "device_info": session.device_info,
+        "created_at": session.created_at,
+        "last_used_at": session.last_used_at,
+        "expires_at": session.expires_at,
+        "is_current": False  # Will be enhanced in future versions
+    }
+
+
 @router.get("/sessions")
 async def get_user_sessions(
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$", description="Stream sessions as NDJSON or a chunked JSON array"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -210,29 +227,19 @@ async def get_user_sessions(
     from sqlalchemy import select, and_
     from datetime import datetime
     
-    result = await db.execute(
-        select(UserSession).where(
-            and_(
-                UserSession.user_id == current_user.id,
-                UserSession.is_active == True,
-                UserSession.expires_at > datetime.utcnow()
-            )
-        ).order_by(UserSession.last_used_at.desc())
-    )
-    sessions = result.scalars().all()
+    query = select(UserSession).where(
+        and_(
+            UserSession.user_id == current_user.id,
+            UserSession.is_active == True,
+            UserSession.expires_at > datetime.utcnow()
+        )
+    ).order_by(UserSession.last_used_at.desc())
+    
+    if stream:
+        return stream_rows_response(query, _session_row, fmt=stream)
     
-    session_list = []
-    for session in sessions:
-        session_list.append({
-            "id": session.id,
-            "ip_address": session.ip_address,
-            "user_agent": session.user_agent,
-            "device_info": session.device_info,
-            "created_at": session.created_at,
-            "last_used_at": session.last_used_at,
-            "expires_at": session.expires_at,
-            "is_current": False  # Will be enhanced in future versions
-        })
+    result = await db.execute(query)
+    session_list = [_session_row(session) for session in result.scalars()]
     
     return {
         "sessions": session_list,
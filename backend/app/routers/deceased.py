@@ -5,27 +5,56 @@ CRUD operations for deceased profiles with Vietnamese cultural features
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from typing import List, Optional
+from sqlalchemy import select, and_, or_, tuple_
+from sqlalchemy.orm import load_only
+from typing import List, Optional, Union
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
+from app.core.responses import stream_rows_response
 from app.models.user import User
 from app.models.deceased import DeceasedProfile
+from app.services.pagination import count_rows, encode_cursor, decode_cursor
+from app.services.profile_search import search_filter, search_rank
 from app.schemas.deceased import (
     DeceasedProfileCreate,
     DeceasedProfileUpdate,
     DeceasedProfileResponse,
-    DeceasedProfileList
+    DeceasedProfileList,
+    DeceasedProfileSearch,
+    DeceasedProfileSummary,
+    DeceasedProfileSummaryList,
+    DeceasedProfilePartialList
+)
+from app.schemas.serializers import (
+    deceased_profile_serializer,
+    deceased_profile_summary_serializer,
+    json_bytes_response
 )
 
 
 router = APIRouter()
 
+# Fields a client may request with fields=...
+PROFILE_FIELDS = tuple(DeceasedProfileResponse.model_fields)
+SUMMARY_FIELDS = tuple(DeceasedProfileSummary.model_fields)
+
+# List endpoints write JSON bytes directly, so the page shapes they can
+# return (full, view=summary, fields=...) are declared for OpenAPI here
+PROFILE_LIST_RESPONSES = {
+    200: {
+        "model": Union[DeceasedProfileList, DeceasedProfileSummaryList, DeceasedProfilePartialList],
+        "description": (
+            "A page of profiles: DeceasedProfileList, DeceasedProfileSummaryList with "
+            "view=summary, or DeceasedProfilePartialList (requested fields plus id) with fields=..."
+        ),
+    },
+}
+
 
 @router.post("/", response_model=DeceasedProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_deceased_profile(
@@ -75,32 +104,7 @@ async def create_deceased_profile(
         await db.commit()
         await db.refresh(deceased_profile)
         
-        return DeceasedProfileResponse(
-        id=deceased_profile.id,
-        family_id=deceased_profile.family_id,
-        created_by=deceased_profile.created_by,
-        vietnamese_name=deceased_profile.vietnamese_name,
-        english_name=deceased_profile.english_name,
-        common_name=deceased_profile.common_name,
-        generation_name=deceased_profile.generation_name,
-        ancestral_title=deceased_profile.ancestral_title,
-        gender=deceased_profile.gender,
-        birth_date=deceased_profile.birth_date,
-        death_date=deceased_profile.death_date,
-        birth_date_lunar=deceased_profile.birth_date_lunar,
-        death_date_lunar=deceased_profile.death_date_lunar,
-        birth_place=deceased_profile.birth_place,
-        death_place=deceased_profile.death_place,
-        resting_place=deceased_profile.resting_place,
-        occupation=deceased_profile.occupation,
-        education=deceased_profile.education,
-        biography=deceased_profile.biography,
-        special_dates=deceased_profile.special_dates,
-        cultural_info=deceased_profile.cultural_info,
-        privacy_level=deceased_profile.privacy_level,
-            created_at=deceased_profile.created_at,
-            updated_at=deceased_profile.updated_at
-        )
+        return deceased_profile_serializer.to_model(deceased_profile)
     except Exception as e:
         logger.error(f"Error creating deceased profile: {str(e)}")
         import traceback
@@ -111,21 +115,13 @@ async def create_deceased_profile(
         )
 
 
-@router.get("/", response_model=DeceasedProfileList)
-async def get_deceased_profiles(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(50, ge=1, le=100, description="Number of records to return"),
-    family_id: Optional[uuid.UUID] = Query(None, description="Filter by family ID"),
-    search: Optional[str] = Query(None, description="Search in names and biography"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+def _accessible_profiles_query(
+    current_user: User,
+    family_id: Optional[uuid.UUID] = None,
+    gender: Optional[str] = None,
+    privacy_level: Optional[str] = None
 ):
-    """
-    Get deceased profiles list
-    
-    Returns paginated list of deceased profiles accessible by the user
-    """
-    # Base query for profiles user can access
+    """Base query for profiles the user can access, with optional filters"""
     query = select(DeceasedProfile).where(
         or_(
             DeceasedProfile.created_by == current_user.id,
@@ -133,67 +129,199 @@ async def get_deceased_profiles(
         )
     )
     
-    # Apply filters
     if family_id:
         query = query.where(DeceasedProfile.family_id == family_id)
+    if gender:
+        query = query.where(DeceasedProfile.gender == gender.lower())
+    if privacy_level:
+        query = query.where(DeceasedProfile.privacy_level == privacy_level.lower())
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            or_(
-                DeceasedProfile.vietnamese_name.ilike(search_term),
-                DeceasedProfile.english_name.ilike(search_term),
-                DeceasedProfile.common_name.ilike(search_term),
-                DeceasedProfile.biography.ilike(search_term)
+    return query
+
+
+def _projection_fields(view: str, fields: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Resolve view/fields into the list of profile fields to load
+    Returns None for the full view
+    """
+    if fields:
+        requested = []
+        for field in fields:
+            requested.extend(name.strip() for name in field.split(",") if name.strip())
+        unknown = sorted(set(requested) - set(PROFILE_FIELDS))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}"
             )
-        )
+        return list(dict.fromkeys(["id", *requested]))
+    
+    if view == "summary":
+        return list(SUMMARY_FIELDS)
+    
+    return None
+
+
+async def _list_profiles(
+    db: AsyncSession,
+    query,
+    skip: int,
+    limit: int,
+    include_total: bool = True,
+    count_mode: str = "exact",
+    cursor: Optional[str] = None,
+    rank=None,
+    view: str = "full",
+    fields: Optional[List[str]] = None,
+    stream: Optional[str] = None
+):
+    """
+    Count and paginate a profile query
+    Ranked (search) results use offset pagination; everything else
+    supports keyset cursors on (created_at, id). Summary and fields
+    views load only the needed columns. With stream, every matching row
+    is written out as it is read instead of returning a single page.
+    """
+    projection = _projection_fields(view, fields)
+    if projection is None:
+        serializer = deceased_profile_serializer
+    elif fields:
+        serializer = deceased_profile_serializer.for_fields(projection)
+    else:
+        serializer = deceased_profile_summary_serializer
     
     # Get total count
-    count_result = await db.execute(
-        select(DeceasedProfile).where(query.whereclause)
-    )
-    total = len(count_result.scalars().all())
+    total, total_is_estimate = None, False
+    if include_total and not stream:
+        total, total_is_estimate = await count_rows(
+            db, DeceasedProfile, query.whereclause, mode=count_mode
+        )
+    
+    # Get paginated results (one extra row tells us whether another page exists)
+    if cursor:
+        if rank is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported for search results"
+            )
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        query = query.where(
+            tuple_(DeceasedProfile.created_at, DeceasedProfile.id) < tuple_(cursor_created_at, cursor_id)
+        )
+        skip = 0
+    
+    order_by = [DeceasedProfile.created_at.desc(), DeceasedProfile.id.desc()]
+    if rank is not None:
+        order_by.insert(0, rank.desc())
+    
+    query = query.order_by(*order_by)
+    if projection is not None:
+        # Cursor values must always be available
+        load_fields = dict.fromkeys([*projection, "id", "created_at"])
+        query = query.options(load_only(*(getattr(DeceasedProfile, name) for name in load_fields)))
     
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(DeceasedProfile.created_at.desc())
-    result = await db.execute(query)
+    if stream:
+        return stream_rows_response(query, serializer.to_dict, fmt=stream, session_info=db.info)
+    
+    result = await db.execute(query.offset(skip).limit(limit + 1))
     profiles = result.scalars().all()
     
-    # Convert to response format
-    profile_responses = []
-    for profile in profiles:
-        profile_responses.append(DeceasedProfileResponse(
-            id=profile.id,
-            family_id=profile.family_id,
-            created_by=profile.created_by,
-            vietnamese_name=profile.vietnamese_name,
-            english_name=profile.english_name,
-            common_name=profile.common_name,
-            generation_name=profile.generation_name,
-            ancestral_title=profile.ancestral_title,
-            gender=profile.gender,
-            birth_date=profile.birth_date,
-            death_date=profile.death_date,
-            birth_date_lunar=profile.birth_date_lunar,
-            death_date_lunar=profile.death_date_lunar,
-            birth_place=profile.birth_place,
-            death_place=profile.death_place,
-            resting_place=profile.resting_place,
-            occupation=profile.occupation,
-            education=profile.education,
-            biography=profile.biography,
-            special_dates=profile.special_dates,
-            cultural_info=profile.cultural_info,
-            privacy_level=profile.privacy_level,
-            created_at=profile.created_at,
-            updated_at=profile.updated_at
-        ))
-    
-    return DeceasedProfileList(
-        profiles=profile_responses,
-        total=total,
-        skip=skip,
-        limit=limit
+    next_cursor = None
+    has_more = len(profiles) > limit
+    profiles = profiles[:limit]
+    if has_more and rank is None:
+        next_cursor = encode_cursor(profiles[-1].created_at, profiles[-1].id)
+    
+    # Rows go straight from ORM attributes to JSON bytes; the envelope
+    # matches DeceasedProfileList (or DeceasedProfileSummaryList)
+    return json_bytes_response({
+        "profiles": serializer.many_to_dicts(profiles),
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
+
+
+@router.get("/", response_model=None, responses=PROFILE_LIST_RESPONSES)
+async def get_deceased_profiles(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(50, ge=1, le=100, description="Number of records to return"),
+    family_id: Optional[uuid.UUID] = Query(None, description="Filter by family ID"),
+    search: Optional[str] = Query(None, description="Full-text search in names and biography"),
+    fuzzy: bool = Query(False, description="Also match names that are similar to the search term"),
+    include_total: bool = Query(True, description="Compute the total number of matching profiles"),
+    count_mode: str = Query("exact", pattern="^(exact|estimated|auto)$", description="Counting strategy: exact, estimated or auto"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (replaces skip)"),
+    view: str = Query("full", pattern="^(summary|full)$", description="Response shape: summary (DeceasedProfileSummary) or full"),
+    fields: Optional[List[str]] = Query(None, description="Comma-separated profile fields to return (overrides view)"),
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$", description="Stream all matching rows as NDJSON or a chunked JSON array (ignores skip/limit)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get deceased profiles list
+    
+    Returns paginated list of deceased profiles accessible by the user.
+    Pass next_cursor back as cursor for keyset pagination; skip/limit
+    offset pagination keeps working for existing clients. With search,
+    results are ordered by relevance. view=summary and fields=... return
+    a slim payload built from a column-restricted query. stream=ndjson
+    or stream=json writes every matching row straight off the database
+    cursor.
+    """
+    query = _accessible_profiles_query(current_user, family_id=family_id)
+    
+    rank = None
+    if search and search.strip():
+        query = query.where(search_filter(search, fuzzy=fuzzy))
+        rank = search_rank(search)
+    
+    return await _list_profiles(
+        db, query, skip, limit,
+        include_total=include_total,
+        count_mode=count_mode,
+        cursor=cursor,
+        rank=rank,
+        view=view,
+        fields=fields,
+        stream=stream
+    )
+
+
+@router.post("/search", response_model=None, responses=PROFILE_LIST_RESPONSES)
+async def search_deceased_profiles(
+    search_data: DeceasedProfileSearch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Search deceased profiles
+    
+    Full-text search over names (weighted highest) and biography, plus
+    diacritic-insensitive name matching, ordered by relevance
+    """
+    query = _accessible_profiles_query(
+        current_user,
+        family_id=search_data.family_id,
+        gender=search_data.gender,
+        privacy_level=search_data.privacy_level
+    ).where(search_filter(search_data.query, fuzzy=search_data.fuzzy))
+    
+    return await _list_profiles(
+        db, query, search_data.skip, search_data.limit,
+        include_total=search_data.include_total,
+        count_mode=search_data.count_mode,
+        rank=search_rank(search_data.query),
+        view=search_data.view,
+        fields=search_data.fields
     )
 
 
@@ -201,7 +329,7 @@ async def get_deceased_profiles(
 async def get_deceased_profile(
     profile_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get specific deceased profile
@@ -227,32 +355,7 @@ async def get_deceased_profile(
             detail="Access denied to this profile"
         )
     
-    return DeceasedProfileResponse(
-        id=profile.id,
-        family_id=profile.family_id,
-        created_by=profile.created_by,
-        vietnamese_name=profile.vietnamese_name,
-        english_name=profile.english_name,
-        common_name=profile.common_name,
-        generation_name=profile.generation_name,
-        ancestral_title=profile.ancestral_title,
-        gender=profile.gender,
-        birth_date=profile.birth_date,
-        death_date=profile.death_date,
-        birth_date_lunar=profile.birth_date_lunar,
-        death_date_lunar=profile.death_date_lunar,
-        birth_place=profile.birth_place,
-        death_place=profile.death_place,
-        resting_place=profile.resting_place,
-        occupation=profile.occupation,
-        education=profile.education,
-        biography=profile.biography,
-        special_dates=profile.special_dates,
-        cultural_info=profile.cultural_info,
-        privacy_level=profile.privacy_level,
-        created_at=profile.created_at,
-        updated_at=profile.updated_at
-    )
+    return deceased_profile_serializer.to_model(profile)
 
 
 @router.put("/{profile_id}", response_model=DeceasedProfileResponse)
@@ -293,32 +396,7 @@ async def update_deceased_profile(
     await db.commit()
     await db.refresh(profile)
     
-    return DeceasedProfileResponse(
-        id=profile.id,
-        family_id=profile.family_id,
-        created_by=profile.created_by,
-        vietnamese_name=profile.vietnamese_name,
-        english_name=profile.english_name,
-        common_name=profile.common_name,
-        generation_name=profile.generation_name,
-        ancestral_title=profile.ancestral_title,
-        gender=profile.gender,
-        birth_date=profile.birth_date,
-        death_date=profile.death_date,
-        birth_date_lunar=profile.birth_date_lunar,
-        death_date_lunar=profile.death_date_lunar,
-        birth_place=profile.birth_place,
-        death_place=profile.death_place,
-        resting_place=profile.resting_place,
-        occupation=profile.occupation,
-        education=profile.education,
-        biography=profile.biography,
-        special_dates=profile.special_dates,
-        cultural_info=profile.cultural_info,
-        privacy_level=profile.privacy_level,
-        created_at=profile.created_at,
-        updated_at=profile.updated_at
-    )
+    return deceased_profile_serializer.to_model(profile)
 
 
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -363,6 +441,7 @@ async def deceased_profiles_status():
         "endpoints": [
             "POST / - Create deceased profile",
             "GET / - List deceased profiles", 
+            "POST /search - Full-text search profiles",
             "GET /{profile_id} - Get specific profile",
             "PUT /{profile_id} - Update profile",
             "DELETE /{profile_id} - Delete profile"
@@ -2,40 +2,80 @@
 Health check endpoints for monitoring and status
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from datetime import datetime
+from typing import Optional
 import sys
 import platform
+import secrets
+import time
 
-from app.core.database import get_db
+from app.core.database import engine, pool_controller, replica_router, statement_cache_metrics
 from app.core.config import settings
+from app.core.session_cache import session_cache
+from app.core.session_activity import session_activity_writer
+from app.core.password_hashing import password_hasher
+from app.core.tokens import token_codec
+from app.core.revocation import revocation_list
+from app.core.session_housekeeping import session_housekeeper
+from app.core.rate_limit import rate_limiter
+from app.core.pool_metrics import pool_stats
+from app.core.health_probe import health_prober
 
 
 router = APIRouter()
 
+metrics_bearer = HTTPBearer(auto_error=False)
+
+
+def require_metrics_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_bearer)
+) -> None:
+    """
+    Gate /api/metrics: 404 when disabled, and a METRICS_TOKEN bearer token
+    unless running in development with no token configured
+    """
+    if not settings.ENABLE_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Metrics are disabled"
+        )
+    
+    if not settings.METRICS_TOKEN:
+        if settings.ENVIRONMENT == "development":
+            return
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Metrics are disabled"
+        )
+    
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
 
 @router.get("/api/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """
     Comprehensive health check endpoint
     Compatible with Node.js implementation
+
+    Database and pool status come from the background health prober,
+    so this endpoint never checks out a connection
     """
-    try:
-        # Test database connection
-        await db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-    
     return {
         "success": True,
         "message": "Trang Vien So API is healthy",
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "version": "2.0.0",
         "environment": settings.ENVIRONMENT,
-        "database": db_status,
+        **health_prober.snapshot(),
         "system": {
             "platform": platform.system(),
             "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
@@ -44,6 +84,37 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     }
 
 
+@router.get("/api/health/live")
+async def liveness_check():
+    """
+    Liveness probe: the worker's event loop is serving requests
+    """
+    return {
+        "status": "alive",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "uptime_seconds": round(time.monotonic() - health_prober.started_at, 3),
+        "event_loop_lag_ms": health_prober.loop_lag_ms
+    }
+
+
+@router.get("/api/health/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness probe: 503 while the database is unreachable, the pool or
+    event loop is overloaded, or the worker is shutting down
+    """
+    reasons = health_prober.not_ready_reasons()
+    if reasons:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    return {
+        "status": "not_ready" if reasons else "ready",
+        "reasons": reasons,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        **health_prober.snapshot()
+    }
+
+
 @router.get("/api/health/simple")
 async def simple_health_check():
     """
@@ -72,4 +143,26 @@ async def status_check():
         "status": "ok",
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "version": "2.0.0"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/api/metrics", dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    """
+    In-process performance counters for this worker
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "auth_session_cache": session_cache.metrics(),
+        "session_activity_writer": session_activity_writer.metrics(),
+        "password_hasher": password_hasher.metrics(),
+        "token_codec": token_codec.metrics(),
+        "revocation_list": revocation_list.metrics() if settings.AUTH_STATELESS_TOKENS else None,
+        "session_housekeeper": session_housekeeper.metrics(),
+        "rate_limiter": rate_limiter.metrics() if settings.RATE_LIMIT_ENABLED else None,
+        "database_pool": pool_stats.metrics(engine.sync_engine.pool),
+        "database_pool_controller": pool_controller.metrics() if settings.DATABASE_POOL_ADAPTIVE else None,
+        "database_replicas": replica_router.metrics() if settings.DATABASE_REPLICA_URLS else None,
+        "database_statement_cache": statement_cache_metrics(),
+        "health_prober": health_prober.metrics(),
+    }
@@ -12,7 +12,8 @@ from .auth import (
 )
 from .deceased import (
     DeceasedProfileCreate, DeceasedProfileUpdate, DeceasedProfileResponse,
-    DeceasedProfileList, DeceasedProfileSearch
+    DeceasedProfileList, DeceasedProfileSearch, DeceasedProfileSummary,
+    DeceasedProfileSummaryList, DeceasedProfilePartial, DeceasedProfilePartialList
 )
 from .family import (
     FamilyCreate, FamilyUpdate, FamilyResponse, FamilyMemberResponse,
@@ -42,6 +43,10 @@ __all__ = [
     "DeceasedProfileResponse",
     "DeceasedProfileList",
     "DeceasedProfileSearch",
+    "DeceasedProfileSummary",
+    "DeceasedProfileSummaryList",
+    "DeceasedProfilePartial",
+    "DeceasedProfilePartialList",
     
     # Family schemas
     "FamilyCreate",
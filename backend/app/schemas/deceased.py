@@ -3,7 +3,7 @@ Deceased profile Pydantic schemas
 Vietnamese memorial app - deceased profile management
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, create_model, validator
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime
 import uuid
@@ -167,12 +167,69 @@ class DeceasedProfileResponse(BaseModel):
         from_attributes = True
 
 
+class DeceasedProfileSummary(BaseModel):
+    """Slim deceased profile schema for gallery and list screens"""
+    id: uuid.UUID
+    family_id: Optional[uuid.UUID]
+    created_by: uuid.UUID
+    vietnamese_name: str
+    english_name: Optional[str]
+    common_name: Optional[str]
+    gender: Optional[str]
+    birth_date: Optional[date]
+    death_date: Optional[date]
+    birth_date_lunar: Optional[str]
+    death_date_lunar: Optional[str]
+    profile_photo: Optional[str]
+    privacy_level: str
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
 class DeceasedProfileList(BaseModel):
     """Deceased profile list schema"""
     profiles: List[DeceasedProfileResponse]
-    total: int = Field(..., description="Total number of profiles")
+    total: Optional[int] = Field(None, description="Total number of profiles (omitted when include_total=false)")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
+    skip: int = Field(..., description="Number of records skipped")
+    limit: int = Field(..., description="Number of records returned")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+
+
+class DeceasedProfileSummaryList(BaseModel):
+    """Deceased profile list schema for view=summary"""
+    profiles: List[DeceasedProfileSummary]
+    total: Optional[int] = Field(None, description="Total number of profiles (omitted when include_total=false)")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
+    skip: int = Field(..., description="Number of records skipped")
+    limit: int = Field(..., description="Number of records returned")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+
+
+# fields=... returns any subset of DeceasedProfileResponse; id is always present
+DeceasedProfilePartial = create_model(
+    "DeceasedProfilePartial",
+    __doc__="Deceased profile with only the fields requested via fields=...",
+    id=(uuid.UUID, ...),
+    **{
+        name: (Optional[field.annotation], None)
+        for name, field in DeceasedProfileResponse.model_fields.items()
+        if name != "id"
+    },
+)
+
+
+class DeceasedProfilePartialList(BaseModel):
+    """Deceased profile list schema for fields=..."""
+    profiles: List[DeceasedProfilePartial]
+    total: Optional[int] = Field(None, description="Total number of profiles (omitted when include_total=false)")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
     skip: int = Field(..., description="Number of records skipped")
     limit: int = Field(..., description="Number of records returned")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
 
 
 class DeceasedProfileSearch(BaseModel):
@@ -180,4 +237,11 @@ class DeceasedProfileSearch(BaseModel):
     query: str = Field(..., min_length=1, description="Search query")
     family_id: Optional[uuid.UUID] = Field(None, description="Filter by family ID")
     gender: Optional[str] = Field(None, description="Filter by gender")
-    privacy_level: Optional[str] = Field(None, description="Filter by privacy level")
\ No newline at end of file
+    privacy_level: Optional[str] = Field(None, description="Filter by privacy level")
+    fuzzy: bool = Field(False, description="Also match names that are similar to the query")
+    skip: int = Field(0, ge=0, description="Number of records to skip")
+    limit: int = Field(50, ge=1, le=100, description="Number of records to return")
+    include_total: bool = Field(True, description="Compute the total number of matches")
+    count_mode: str = Field("exact", pattern="^(exact|estimated|auto)$", description="Counting strategy: exact, estimated or auto")
+    view: str = Field("full", pattern="^(summary|full)$", description="Response shape: summary or full")
+    fields: Optional[List[str]] = Field(None, description="Only return these profile fields (overrides view)")
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Precompiled ORM-to-response serializers
+Attribute getters are built once at import time, so hot endpoints can turn
+ORM rows into JSON bytes without rebuilding or revalidating pydantic models
+"""
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.responses import FastJSONResponse, dumps
+from .deceased import DeceasedProfileResponse, DeceasedProfileSummary
+from .user import UserResponse
+
+
+class ResponseSerializer:
+    """
+    Serializer for one response schema
+
+    to_model() goes through model_validate(from_attributes=True) and is meant
+    for single objects returned via response_model. to_dict()/to_json() read
+    the schema's fields straight off the ORM object with one attrgetter call
+    and skip validation, which is what list endpoints want.
+    """
+
+    def __init__(self, schema: Type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.schema = schema
+        self.fields: Tuple[str, ...] = tuple(fields or schema.model_fields)
+        getter = attrgetter(*self.fields)
+        if len(self.fields) == 1:
+            # attrgetter returns a bare value rather than a tuple for one field
+            self._values = lambda obj: (getter(obj),)
+        else:
+            self._values = getter
+
+    def to_model(self, obj: Any) -> BaseModel:
+        return self.schema.model_validate(obj, from_attributes=True)
+
+    def to_dict(self, obj: Any) -> Dict[str, Any]:
+        return dict(zip(self.fields, self._values(obj)))
+
+    def many_to_dicts(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        fields, values = self.fields, self._values
+        return [dict(zip(fields, values(obj))) for obj in objs]
+
+    def to_json(self, obj: Any) -> bytes:
+        return dumps(self.to_dict(obj))
+
+    def for_fields(self, fields: Sequence[str]) -> "ResponseSerializer":
+        """Serializer restricted to a subset of fields (cached per field list)"""
+        return _subset_serializer(self.schema, tuple(fields))
+
+
+@lru_cache(maxsize=128)
+def _subset_serializer(schema: Type[BaseModel], fields: Tuple[str, ...]) -> ResponseSerializer:
+    return ResponseSerializer(schema, fields)
+
+
+def json_bytes_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    """Encode plain data (UUID, datetime, date included) directly to a JSON response"""
+    return FastJSONResponse(content=content, status_code=status_code)
+
+
+# Serializers compiled at import time
+deceased_profile_serializer = ResponseSerializer(DeceasedProfileResponse)
+deceased_profile_summary_serializer = ResponseSerializer(DeceasedProfileSummary)
+user_serializer = ResponseSerializer(UserResponse)
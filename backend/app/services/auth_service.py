@@ -7,16 +7,34 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple, Dict, Any
 import uuid
 import hashlib
+import logging
 import secrets
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_, inspect
 from fastapi import HTTPException, status
 
 from app.models.user import User, UserSession
-from app.core.security import verify_password, hash_password, generate_tokens, verify_token
+from app.core.security import (
+    generate_tokens, verify_token, create_access_token, create_refresh_token
+)
+from app.core.password_hashing import password_hasher
 from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.session_cache import (
+    session_cache, snapshot_claims, SESSION_SNAPSHOT_FIELDS, USER_SNAPSHOT_FIELDS
+)
 from app.schemas.user import UserRegisterRequest, UserLoginRequest
 from app.schemas.auth import LoginResponse, TokenResponse
+from app.schemas.serializers import user_serializer
+
+logger = logging.getLogger(__name__)
+
+
+# Columns loaded by the joined session + user lookup on the auth path
+AUTH_LOOKUP_COLUMNS = (
+    [getattr(UserSession, name).label(f"session__{name}") for name in SESSION_SNAPSHOT_FIELDS]
+    + [getattr(User, name).label(f"user__{name}") for name in USER_SNAPSHOT_FIELDS]
+)
 
 
 class AuthService:
@@ -39,7 +57,7 @@ class AuthService:
             )
         
         # Create new user
-        password_hash = hash_password(user_data.password)
+        password_hash = await password_hasher.hash(user_data.password)
         new_user = User(
             email=user_data.email,
             password_hash=password_hash,
@@ -64,24 +82,7 @@ class AuthService:
         await self.db.refresh(new_user)
         
         # Create response
-        from app.schemas.user import UserResponse
-        user_response = UserResponse(
-            id=new_user.id,
-            email=new_user.email,
-            first_name=new_user.first_name,
-            last_name=new_user.last_name,
-            phone_number=new_user.phone_number,
-            avatar=new_user.avatar,
-            email_verified=new_user.email_verified,
-            email_verified_at=new_user.email_verified_at,
-            language=new_user.language,
-            timezone=new_user.timezone,
-            notification_preferences=new_user.notification_preferences,
-            privacy_settings=new_user.privacy_settings,
-            created_at=new_user.created_at,
-            updated_at=new_user.updated_at,
-            last_login_at=new_user.last_login_at
-        )
+        user_response = user_serializer.to_model(new_user)
         
         return LoginResponse(
             success=True,
@@ -100,12 +101,16 @@ class AuthService:
         )
         user = result.scalar_one_or_none()
         
-        if not user or not verify_password(login_data.password, user.password_hash):
+        if not user or not await password_hasher.verify(login_data.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
+        # Upgrade hashes made with a stale cost without delaying the response
+        if password_hasher.needs_rehash(user.password_hash):
+            password_hasher.schedule_rehash(user.id, login_data.password, user.password_hash)
+        
         # Update last login
         user.last_login_at = datetime.utcnow()
         
@@ -120,24 +125,7 @@ class AuthService:
         await self.db.refresh(user)
         
         # Create response
-        from app.schemas.user import UserResponse
-        user_response = UserResponse(
-            id=user.id,
-            email=user.email,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            phone_number=user.phone_number,
-            avatar=user.avatar,
-            email_verified=user.email_verified,
-            email_verified_at=user.email_verified_at,
-            language=user.language,
-            timezone=user.timezone,
-            notification_preferences=user.notification_preferences,
-            privacy_settings=user.privacy_settings,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-            last_login_at=user.last_login_at
-        )
+        user_response = user_serializer.to_model(user)
         
         return LoginResponse(
             success=True,
@@ -148,7 +136,11 @@ class AuthService:
         )
     
     async def refresh_token(self, refresh_token: str, ip_address: str = None) -> TokenResponse:
-        """Refresh access token using refresh token"""
+        """
+        Rotate a refresh token
+        The stored refresh_token_hash is swapped atomically, so each refresh
+        token works once; presenting an already-rotated token revokes the session
+        """
         
         # Verify refresh token
         payload = verify_token(refresh_token, token_type="refresh")
@@ -159,49 +151,85 @@ class AuthService:
             )
         
         session_id = payload.get("session_id")
-        if not session_id:
+        user_id = payload.get("user_id")
+        if not session_id or not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload"
+            )
+        
+        try:
+            session_uuid = uuid.UUID(str(session_id))
+        except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload"
             )
         
-        # Find active session
+        new_refresh_token = create_refresh_token(
+            data={
+                "user_id": str(user_id),
+                "session_id": str(session_uuid),
+                "type": "refresh",
+                "jti": secrets.token_urlsafe(8)
+            },
+            expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+        
+        old_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
+        now = datetime.utcnow()
+        session_updates = {
+            "refresh_token_hash": hashlib.sha256(new_refresh_token.encode()).hexdigest(),
+            "previous_refresh_token_hash": old_hash,
+            "refresh_rotated_at": now,
+            "last_used_at": now,
+        }
+        if ip_address:
+            session_updates["ip_address"] = ip_address
+        
+        # Compare-and-swap the refresh token and load the user in one round trip
         result = await self.db.execute(
-            select(UserSession).where(
+            update(UserSession)
+            .where(
                 and_(
-                    UserSession.id == session_id,
+                    UserSession.id == session_uuid,
+                    UserSession.refresh_token_hash == old_hash,
                     UserSession.is_active == True,
-                    UserSession.expires_at > datetime.utcnow()
+                    UserSession.expires_at > now,
+                    User.id == UserSession.user_id
                 )
             )
+            .values(**session_updates)
+            .returning(*AUTH_LOOKUP_COLUMNS)
+            .execution_options(synchronize_session=False)
         )
-        session = result.scalar_one_or_none()
+        row = result.mappings().one_or_none()
         
-        if not session:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Session not found or expired"
-            )
+        if row is None:
+            await self.db.rollback()
+            await self._handle_refresh_miss(session_uuid, old_hash, now)
         
-        # Generate new tokens
-        user_id = session.user_id
-        expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-        expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+        await self.db.commit()
+        session_cache.invalidate(session_uuid)
         
-        access_token, new_refresh_token = generate_tokens(
-            user_id=user_id,
-            session_id=session.id,
-            access_expire_minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-            refresh_expire_days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
+        session_data = {name: row[f"session__{name}"] for name in SESSION_SNAPSHOT_FIELDS}
+        user_data = {name: row[f"user__{name}"] for name in USER_SNAPSHOT_FIELDS}
         
-        # Update session
-        session.refresh_token_hash = hashlib.sha256(new_refresh_token.encode()).hexdigest()
-        session.last_used_at = datetime.utcnow()
-        if ip_address:
-            session.ip_address = ip_address
+        access_claims = None
+        if settings.AUTH_STATELESS_TOKENS:
+            access_claims = snapshot_claims(user_data, session_data["expires_at"])
         
-        await self.db.commit()
+        expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+        access_token = create_access_token(
+            data={
+                **(access_claims or {}),
+                "user_id": str(user_data["id"]),
+                "session_id": str(session_uuid),
+                "type": "access"
+            },
+            expires_delta=timedelta(seconds=expires_in)
+        )
         
         return TokenResponse(
             access_token=access_token,
@@ -211,6 +239,57 @@ class AuthService:
             expires_at=expires_at
         )
     
+    async def _handle_refresh_miss(self, session_id: uuid.UUID, presented_hash: str, now: datetime):
+        """
+        Explain a failed rotation and revoke the session on token reuse
+        Always raises
+        """
+        result = await self.db.execute(
+            select(
+                UserSession.is_active,
+                UserSession.expires_at,
+                UserSession.previous_refresh_token_hash,
+                UserSession.refresh_rotated_at
+            ).where(UserSession.id == session_id)
+        )
+        session = result.one_or_none()
+        
+        if session is None or not session.is_active or session.expires_at <= now:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session not found or expired"
+            )
+        
+        # Two tabs refreshing with the same token at once: the loser just retries
+        # with the token the winner stored, so a just-rotated token is not reuse
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if (
+            session.previous_refresh_token_hash == presented_hash
+            and session.refresh_rotated_at is not None
+            and now - session.refresh_rotated_at <= grace
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Refresh token was just rotated by another request"
+            )
+        
+        # A validly signed but superseded token: assume it leaked
+        await self.db.execute(
+            update(UserSession)
+            .where(and_(UserSession.id == session_id, UserSession.is_active == True))
+            .values(is_active=False, revoked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        session_cache.invalidate(session_id)
+        revocation_list.add([session_id])
+        logger.warning(f"⚠️ Refresh token reuse detected, session {session_id} revoked")
+        
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token reuse detected; session revoked"
+        )
+    
     async def logout_user(self, session_id: uuid.UUID) -> bool:
         """Logout user by deactivating session"""
         
@@ -221,7 +300,10 @@ class AuthService:
         
         if session:
             session.is_active = False
+            session.revoked_at = datetime.utcnow()
             await self.db.commit()
+            session_cache.invalidate(session_id)
+            revocation_list.add([session_id])
             return True
         
         return False
@@ -229,27 +311,39 @@ class AuthService:
     async def logout_all_sessions(self, user_id: uuid.UUID) -> int:
         """Logout user from all sessions"""
         
+        # One set-based UPDATE; the returned ids drive cache invalidation and revocation
         result = await self.db.execute(
-            select(UserSession).where(
+            update(UserSession)
+            .where(
                 and_(
                     UserSession.user_id == user_id,
                     UserSession.is_active == True
                 )
             )
+            .values(is_active=False, revoked_at=datetime.utcnow())
+            .returning(UserSession.id)
+            .execution_options(synchronize_session=False)
         )
-        sessions = result.scalars().all()
-        
-        for session in sessions:
-            session.is_active = False
+        session_ids = result.scalars().all()
         
         await self.db.commit()
-        return len(sessions)
+        for session_id in session_ids:
+            session_cache.invalidate(session_id)
+        revocation_list.add(session_ids)
+        return len(session_ids)
     
-    async def validate_session(self, session_id: uuid.UUID) -> Optional[UserSession]:
-        """Validate and return active session"""
+    async def get_session_with_user(
+        self, session_id: uuid.UUID
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Fetch an active session and its user in one joined query
+        Returns (session, user) column snapshots, or None if the session is invalid
+        """
         
         result = await self.db.execute(
-            select(UserSession).where(
+            select(*AUTH_LOOKUP_COLUMNS)
+            .join(User, User.id == UserSession.user_id)
+            .where(
                 and_(
                     UserSession.id == session_id,
                     UserSession.is_active == True,
@@ -257,7 +351,13 @@ class AuthService:
                 )
             )
         )
-        return result.scalar_one_or_none()
+        row = result.mappings().one_or_none()
+        if row is None:
+            return None
+        
+        session_data = {name: row[f"session__{name}"] for name in SESSION_SNAPSHOT_FIELDS}
+        user_data = {name: row[f"user__{name}"] for name in USER_SNAPSHOT_FIELDS}
+        return session_data, user_data
     
     async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """Get user by ID"""
@@ -297,11 +397,16 @@ class AuthService:
         await self.db.flush()  # Get session ID
         
         # Generate tokens
+        access_claims = None
+        if settings.AUTH_STATELESS_TOKENS:
+            access_claims = snapshot_claims(self._user_snapshot(user), expires_at)
+        
         access_token, refresh_token = generate_tokens(
             user_id=user.id,
             session_id=session.id,
             access_expire_minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-            refresh_expire_days=refresh_expire_days
+            refresh_expire_days=refresh_expire_days,
+            access_claims=access_claims
         )
         
         # Store actual token hashes
@@ -322,6 +427,16 @@ class AuthService:
         
         return tokens, session
     
+    def _user_snapshot(self, user: User) -> Dict[str, Any]:
+        """Loaded user columns, without triggering lazy loads of expired ones"""
+        loaded = inspect(user).dict
+        snapshot = {name: loaded.get(name) for name in USER_SNAPSHOT_FIELDS}
+        # Server-side timestamps of a just-inserted user are not loaded yet
+        now = datetime.utcnow()
+        snapshot["created_at"] = snapshot["created_at"] or now
+        snapshot["updated_at"] = snapshot["updated_at"] or now
+        return snapshot
+    
     def _parse_device_info(self, user_agent: str) -> Dict[str, Any]:
         """Parse device information from user agent"""
         # Simple device info parsing - could be enhanced with user-agents library
@@ -0,0 +1,115 @@
+"""
+Pagination helpers for list endpoints
+Row counting strategies and opaque keyset cursors
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Tuple
+import base64
+import json
+import uuid
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import settings
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the statement's bound parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def count_exact(db: AsyncSession, model: Any, whereclause: Optional[Any] = None) -> int:
+    """SELECT count(*) over the same filter, without loading any rows"""
+    statement = select(func.count()).select_from(model)
+    if whereclause is not None:
+        statement = statement.where(whereclause)
+    result = await db.execute(statement)
+    return result.scalar_one()
+
+
+async def estimate_table_rows(db: AsyncSession, table_name: str) -> int:
+    """Planner statistics for an unfiltered table (pg_class.reltuples)"""
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name}
+    )
+    estimate = result.scalar_one_or_none()
+    # reltuples is -1 for tables that were never analyzed
+    return max(int(estimate or 0), 0)
+
+
+async def estimate_count(db: AsyncSession, model: Any, whereclause: Optional[Any] = None) -> int:
+    """Planner row estimate for the filtered query (EXPLAIN, nothing is executed)"""
+    if whereclause is None:
+        return await estimate_table_rows(db, model.__tablename__)
+
+    statement = select(model.id).where(whereclause)
+    result = await db.execute(_Explain(statement))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession,
+    model: Any,
+    whereclause: Optional[Any] = None,
+    mode: str = "exact"
+) -> Tuple[int, bool]:
+    """
+    Count rows matching a filter
+    Returns (total, is_estimate)
+
+    - exact: SELECT count(*)
+    - estimated: planner estimate only
+    - auto: planner estimate when it exceeds COUNT_ESTIMATE_THRESHOLD,
+      exact count otherwise
+    """
+    if mode == "exact":
+        return await count_exact(db, model, whereclause), False
+
+    estimate = await estimate_count(db, model, whereclause)
+    if mode == "estimated" or estimate > settings.COUNT_ESTIMATE_THRESHOLD:
+        return estimate, True
+
+    return await count_exact(db, model, whereclause), False
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque URL-safe token"""
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor
+    Raises ValueError for malformed or tampered cursors
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if (
+            not isinstance(position, list)
+            or len(position) != 2
+            or not all(isinstance(part, str) for part in position)
+        ):
+            raise ValueError("Cursor must encode [created_at, id] strings")
+        created_at, row_id = position
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
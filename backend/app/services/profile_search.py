@@ -0,0 +1,51 @@
+"""
+Deceased profile search
+Full-text matching over DeceasedProfile.search_vector plus
+diacritic-insensitive name lookups over DeceasedProfile.search_name
+"""
+
+from sqlalchemy import func, literal, or_
+
+from app.core.vietnamese import normalize_vietnamese
+from app.models.deceased import DeceasedProfile
+
+
+# The 'simple' configuration lowercases and tokenizes without stemming,
+# which suits Vietnamese syllables and mixed Vietnamese/English names
+SEARCH_CONFIG = "simple"
+
+
+def search_query(term: str):
+    """Parse user input with web-search syntax ("quoted phrases", -exclusions, or)"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_filter(term: str, fuzzy: bool = False):
+    """
+    WHERE clause for a search term
+    Matches the GIN-indexed tsvector, or the trigram-indexed normalized
+    names, so "Nguyen Van An" finds "Nguyễn Văn An". With fuzzy, names
+    within pg_trgm's word-similarity threshold also match.
+    """
+    conditions = [DeceasedProfile.search_vector.bool_op("@@")(search_query(term))]
+
+    normalized = normalize_vietnamese(term)
+    if normalized:
+        conditions.append(
+            DeceasedProfile.search_name.like(f"%{_escape_like(normalized)}%", escape="\\")
+        )
+        if fuzzy:
+            conditions.append(literal(normalized).bool_op("<%")(DeceasedProfile.search_name))
+
+    return or_(*conditions)
+
+
+def search_rank(term: str):
+    """Relevance score: weighted full-text rank plus name similarity"""
+    text_rank = func.ts_rank(DeceasedProfile.search_vector, search_query(term))
+    name_rank = func.word_similarity(normalize_vietnamese(term), DeceasedProfile.search_name)
+    return func.coalesce(text_rank, 0) + func.coalesce(name_rank, 0)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Auth lookup benchmark
+Compares the two-query session + user path against the joined lookup
+
+Usage (from backend/, with DATABASE_URL pointing at a seeded database):
+    python benchmarks/bench_auth_lookup.py [iterations]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, and_
+
+from app.core.database import AsyncSessionLocal, close_db
+from app.models.user import UserSession
+from app.services.auth_service import AuthService
+
+
+async def find_active_session():
+    """Pick any active session to benchmark against"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(UserSession.id, UserSession.user_id).where(
+                and_(
+                    UserSession.is_active == True,
+                    UserSession.expires_at > datetime.utcnow()
+                )
+            ).limit(1)
+        )
+        return result.first()
+
+
+async def two_query_path(db, session_id, user_id):
+    result = await db.execute(
+        select(UserSession).where(
+            and_(
+                UserSession.id == session_id,
+                UserSession.is_active == True,
+                UserSession.expires_at > datetime.utcnow()
+            )
+        )
+    )
+    session = result.scalar_one_or_none()
+    user = await AuthService(db).get_user_by_id(user_id)
+    return session, user
+
+
+async def joined_path(db, session_id, user_id):
+    auth_service = AuthService(db)
+    return await auth_service.get_session_with_user(session_id)
+
+
+async def measure(name, lookup, session_id, user_id, iterations):
+    """Run a lookup repeatedly on one connection and collect latencies"""
+    timings = []
+    async with AsyncSessionLocal() as db:
+        # Warm up the connection and statement caches
+        for _ in range(20):
+            await lookup(db, session_id, user_id)
+            await db.rollback()
+
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await lookup(db, session_id, user_id)
+            timings.append((time.perf_counter() - start) * 1000)
+            await db.rollback()
+
+    timings.sort()
+    print(
+        f"   {name:<12} mean={statistics.mean(timings):.3f}ms "
+        f"p50={timings[len(timings) // 2]:.3f}ms "
+        f"p95={timings[int(len(timings) * 0.95)]:.3f}ms"
+    )
+    return statistics.mean(timings)
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print("⏱️  Auth lookup benchmark")
+    print("=" * 50)
+
+    row = await find_active_session()
+    if row is None:
+        print("❌ No active session found - log in once before running the benchmark")
+        return 1
+
+    session_id, user_id = row
+    print(f"🔗 Session: {str(session_id)[:8]}... ({iterations} iterations)")
+
+    two_query = await measure("two-query", two_query_path, session_id, user_id, iterations)
+    joined = await measure("joined", joined_path, session_id, user_id, iterations)
+
+    print("=" * 50)
+    print(f"📉 Latency drop: {(1 - joined / two_query) * 100:.1f}%")
+
+    await close_db()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+JSONB codec benchmark
+Compares SQLAlchemy's default asyncpg jsonb codec (stdlib json.loads on a
+decoded copy) with the orjson codec registered in core/database.py, on
+the binary wire values of a page of profile JSONB columns
+
+Usage (from backend/, no database needed):
+    python benchmarks/bench_jsonb_codec.py [profiles] [rounds]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import _decode_jsonb, _encode_jsonb, json_dumps
+
+
+def profile_columns(i):
+    """special_dates, location_info and cultural_info of one profile"""
+    return [
+        {
+            "ngay_gio": {"am_lich": f"{i % 28 + 1}/{i % 12 + 1}", "duong_lich": "2024-03-15"},
+            "thanh_minh": "2024-04-04",
+            "ghi_chu": "Giỗ đầu của ông nội, cả họ về quê thắp hương",
+        },
+        {
+            "que_quan": "Xã Phước Hưng, huyện Long Điền, tỉnh Bà Rịa - Vũng Tàu",
+            "noi_an_tang": {"nghia_trang": "Nghĩa trang Bình Hưng Hòa", "khu": "B", "lo": i},
+            "toa_do": [10.7769, 106.7009],
+        },
+        {
+            "ton_giao": "Phật giáo",
+            "phap_danh": "Thiện Tâm",
+            "nghi_le": ["cúng cơm", "tụng kinh", "thắp nhang"],
+            "con_chau": [{"ten": f"Nguyễn Văn {n}", "quan_he": "cháu"} for n in "ABCDE"],
+        },
+    ]
+
+
+def default_decoder(bin_value):
+    """SQLAlchemy's asyncpg jsonb decoder"""
+    return json.loads(bin_value[1:].decode())
+
+
+def measure(name, decode, values, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in values:
+            decode(value)
+    elapsed = time.perf_counter() - start
+    per_page = elapsed / rounds * 1000
+    print(f"   {name:<22} {per_page:8.3f}ms per page")
+    return per_page
+
+
+def main():
+    profiles = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    # What asyncpg hands the decoder: binary jsonb (version byte + text)
+    documents = [doc for i in range(profiles) for doc in profile_columns(i)]
+    values = [_encode_jsonb(json.dumps(doc)) for doc in documents]
+
+    # The orjson path must round-trip Vietnamese text exactly
+    assert [_decode_jsonb(v) for v in values] == documents
+    assert [_decode_jsonb(_encode_jsonb(json_dumps(doc))) for doc in documents] == documents
+
+    print("⏱️  JSONB decode benchmark")
+    print("=" * 50)
+    print(f"📦 {profiles} profiles x 3 JSONB columns, {rounds} rounds")
+
+    before = measure("stdlib json (default)", default_decoder, values, rounds)
+    after = measure("orjson codec", _decode_jsonb, values, rounds)
+
+    print("=" * 50)
+    print(f"🚀 Speedup: {before / after:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
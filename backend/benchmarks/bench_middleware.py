@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+HTTP middleware overhead benchmark
+Compares the two stacked @app.middleware("http") functions (BaseHTTPMiddleware)
+with the single pure-ASGI InstrumentationMiddleware, driving each app in
+process through httpx's ASGI transport
+
+Usage (from backend/, no database needed):
+    python benchmarks/bench_middleware.py [requests] [concurrency]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.core.middleware import InstrumentationMiddleware
+
+logger = logging.getLogger("app.main")
+
+
+async def status_endpoint():
+    return {"status": "ok", "version": "2.0.0"}
+
+
+def legacy_app() -> FastAPI:
+    """The previous main.py middleware stack"""
+    app = FastAPI()
+    app.get("/api/status")(status_endpoint)
+
+    @app.middleware("http")
+    async def add_process_time_header(request: Request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        response.headers["X-API-Version"] = "2.0.0"
+        return response
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.perf_counter()
+        logger.info(f"📥 {request.method} {request.url.path} - {request.client.host}")
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        logger.info(
+            f"📤 {request.method} {request.url.path} - "
+            f"Status: {response.status_code} - "
+            f"Time: {process_time:.4f}s"
+        )
+        return response
+
+    return app
+
+
+def asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.get("/api/status")(status_endpoint)
+    app.add_middleware(InstrumentationMiddleware, api_version="2.0.0")
+    return app
+
+
+async def drive(app, total, concurrency):
+    """Send ``total`` requests with ``concurrency`` in flight; returns latencies"""
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 12345))
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(count):
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.get("/api/status")
+                latencies.append(time.perf_counter() - start)
+                assert "x-process-time" in response.headers
+
+        await client.get("/api/status")  # warm up
+        per_worker = total // concurrency
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def report(name, latencies, elapsed):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    rate = len(latencies) / elapsed
+    print(
+        f"   {name:<26} {rate:>8,.0f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:6.3f}ms   p99 {p99 * 1000:6.3f}ms"
+    )
+    return rate
+
+
+async def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    # Access logging on, but written nowhere, so formatting cost is included
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print("⏱️  Middleware overhead benchmark")
+    print("=" * 70)
+    print(f"📦 {total} requests, {concurrency} concurrent")
+
+    before = report("2x BaseHTTPMiddleware", *await drive(legacy_app(), total, concurrency))
+    after = report("pure ASGI instrumentation", *await drive(asgi_app(), total, concurrency))
+
+    print("=" * 70)
+    print(f"🚀 Throughput gain: {after / before:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Profile serialization microbenchmark
+Compares hand-built DeceasedProfileResponse objects (the old list path)
+with the precompiled serializer that writes ORM rows straight to JSON bytes
+
+Usage (from backend/, no database needed):
+    python benchmarks/bench_serializers.py [rows] [rounds]
+"""
+
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401  (configure all mappers)
+from app.models.deceased import DeceasedProfile
+from app.schemas.deceased import DeceasedProfileList, DeceasedProfileResponse
+from app.schemas.serializers import deceased_profile_serializer, json_bytes_response
+
+
+def make_profiles(count):
+    """Transient ORM rows with realistic Vietnamese content"""
+    now = datetime.utcnow()
+    return [
+        DeceasedProfile(
+            id=uuid.uuid4(),
+            family_id=uuid.uuid4(),
+            created_by=uuid.uuid4(),
+            vietnamese_name=f"Nguyễn Văn Ân {i}",
+            english_name="An Nguyen",
+            common_name="Ông Ân",
+            generation_name="Văn",
+            ancestral_title="Cụ ông",
+            gender="nam",
+            birth_date=date(1930, 1, 1),
+            death_date=date(2010, 5, 20),
+            birth_date_lunar="Mùng 3 tháng Giêng năm Canh Ngọ",
+            death_date_lunar="Ngày 7 tháng 4 năm Canh Dần",
+            birth_place="Hà Nội",
+            death_place="Thành phố Hồ Chí Minh",
+            resting_place="Nghĩa trang Văn Điển",
+            occupation="Giáo viên",
+            education="Đại học Sư phạm",
+            biography="Một cuộc đời tận tụy với gia đình và học trò. " * 20,
+            special_dates={"gio": "07/04", "notes": ["Giỗ đầu", "Giỗ hết"]},
+            cultural_info={"religion": "Phật giáo", "hometown": "Nam Định"},
+            privacy_level="family",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def old_path(profiles):
+    """Field-by-field model construction, then FastAPI-style JSON dump"""
+    responses = [
+        DeceasedProfileResponse(
+            id=p.id, family_id=p.family_id, created_by=p.created_by,
+            vietnamese_name=p.vietnamese_name, english_name=p.english_name,
+            common_name=p.common_name, generation_name=p.generation_name,
+            ancestral_title=p.ancestral_title, gender=p.gender,
+            birth_date=p.birth_date, death_date=p.death_date,
+            birth_date_lunar=p.birth_date_lunar, death_date_lunar=p.death_date_lunar,
+            birth_place=p.birth_place, death_place=p.death_place,
+            resting_place=p.resting_place, occupation=p.occupation,
+            education=p.education, biography=p.biography,
+            special_dates=p.special_dates, cultural_info=p.cultural_info,
+            privacy_level=p.privacy_level, created_at=p.created_at,
+            updated_at=p.updated_at,
+        )
+        for p in profiles
+    ]
+    envelope = DeceasedProfileList(profiles=responses, total=len(profiles), skip=0, limit=len(profiles))
+    # response_model revalidates the returned model before dumping it
+    return DeceasedProfileList.model_validate(envelope).model_dump_json().encode()
+
+
+def new_path(profiles):
+    """Precompiled attrgetter rows encoded straight to bytes"""
+    return json_bytes_response({
+        "profiles": deceased_profile_serializer.many_to_dicts(profiles),
+        "total": len(profiles),
+        "total_is_estimate": False,
+        "skip": 0,
+        "limit": len(profiles),
+        "next_cursor": None,
+    }).body
+
+
+def measure(name, func, profiles, rounds):
+    func(profiles)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(profiles)
+    elapsed = time.perf_counter() - start
+    per_row_us = elapsed / (rounds * len(profiles)) * 1_000_000
+    print(f"   {name:<22} {per_row_us:8.2f} µs/row")
+    return per_row_us
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print("⏱️  Profile serialization benchmark")
+    print("=" * 50)
+    print(f"📦 {rows} rows x {rounds} rounds")
+
+    profiles = make_profiles(rows)
+    before = measure("hand-built models", old_path, profiles, rounds)
+    after = measure("precompiled serializer", new_path, profiles, rounds)
+
+    print("=" * 50)
+    print(f"🚀 Speedup: {before / after:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Statement cache benchmark
+Runs the hot profile and login queries against direct Postgres with the
+default prepared statement cache, PgBouncer with the cache disabled, and
+PgBouncer in the "pgbouncer" statement cache mode
+
+PgBouncer must be >= 1.21 and run with pool_mode = transaction and
+max_prepared_statements > 0 (e.g. 200) for the last scenario.
+
+Usage (from backend/, with the schema migrated on both URLs):
+    python benchmarks/bench_statement_cache.py DIRECT_URL PGBOUNCER_URL [transactions] [concurrency]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import statement_cache_connect_args
+from app.models.deceased import DeceasedProfile
+from app.models.user import User
+
+
+async def transaction(db: AsyncSession, profile_id, email):
+    """The statements behind a login and a profile page view"""
+    await db.execute(select(User).where(User.email == email))
+    await db.execute(
+        select(DeceasedProfile)
+        .where(DeceasedProfile.privacy_level == "public")
+        .order_by(DeceasedProfile.created_at.desc(), DeceasedProfile.id.desc())
+        .limit(51)
+    )
+    await db.execute(select(DeceasedProfile).where(DeceasedProfile.id == profile_id))
+    await db.commit()
+
+
+async def run(name, url, mode, total, concurrency):
+    engine = create_async_engine(
+        url,
+        pool_size=concurrency,
+        max_overflow=0,
+        query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+        connect_args=statement_cache_connect_args(mode, settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE),
+    )
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    latencies = []
+
+    async def worker(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            async with sessions() as db:
+                await transaction(db, uuid.uuid4(), f"{uuid.uuid4().hex}@example.com")
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        # Warm up connections and caches
+        await asyncio.gather(*(worker(5) for _ in range(concurrency)))
+        latencies.clear()
+
+        per_worker = total // concurrency
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        print(f"   {name:<28} ❌ {type(e).__name__}: {str(e).splitlines()[0]}")
+        return None
+    finally:
+        await engine.dispose()
+
+    latencies.sort()
+    rate = len(latencies) / elapsed
+    print(
+        f"   {name:<28} {rate:>8,.0f} tx/s   "
+        f"p50 {statistics.median(latencies) * 1000:6.3f}ms   "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.3f}ms"
+    )
+    return rate
+
+
+async def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return 1
+
+    direct_url, pgbouncer_url = sys.argv[1], sys.argv[2]
+    total = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+
+    print("⏱️  Statement cache benchmark")
+    print("=" * 70)
+    print(f"📦 {total} transactions (3 queries each), {concurrency} concurrent")
+
+    direct = await run("direct, default cache", direct_url, "default", total, concurrency)
+    disabled = await run("pgbouncer, cache disabled", pgbouncer_url, "disabled", total, concurrency)
+    bouncer = await run("pgbouncer, pgbouncer mode", pgbouncer_url, "pgbouncer", total, concurrency)
+
+    print("=" * 70)
+    if disabled and bouncer:
+        print(f"🚀 pgbouncer mode vs cache disabled: {bouncer / disabled:.2f}x")
+    if direct and bouncer:
+        print(f"🔁 pgbouncer mode vs direct: {bouncer / direct:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
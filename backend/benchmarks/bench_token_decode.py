@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Token decode benchmark
+Compares the previous jose jwt.decode-based verify_token with the token
+codec, both uncached and with the decoded-payload LRU
+
+Usage (from backend/, no database needed):
+    python benchmarks/bench_token_decode.py [iterations]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.core.security import generate_tokens
+from app.core.tokens import TokenCodec, load_keyring
+
+
+KEYS, ACTIVE_KID, _, _ = load_keyring(settings)
+
+
+def legacy_verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+    """verify_token as it was before the codec"""
+    try:
+        payload = jwt.decode(token, KEYS[ACTIVE_KID], algorithms=[settings.JWT_ALGORITHM])
+        if token_type == "refresh" and payload.get("type") != "refresh":
+            return None
+        exp = payload.get("exp")
+        if exp is None or datetime.utcnow().timestamp() > exp:
+            return None
+        return payload
+    except JWTError:
+        return None
+
+
+def measure(name, func, token, iterations):
+    assert func(token) is not None, f"{name} rejected a valid token"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(token)
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"   {name:<22} {rate:>10,.0f} tokens/s  ({elapsed / iterations * 1_000_000:.2f} µs)")
+    return rate
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print("⏱️  Token decode benchmark")
+    print("=" * 60)
+    print(f"🔑 {settings.JWT_ALGORITHM}, {iterations} decodes per variant")
+
+    access_token, _ = generate_tokens("user-id", "session-id")
+    uncached = TokenCodec(KEYS, ACTIVE_KID, settings.JWT_ALGORITHM, cache_size=0)
+    cached = TokenCodec(KEYS, ACTIVE_KID, settings.JWT_ALGORITHM, cache_size=1024)
+
+    baseline = measure("jose jwt.decode", legacy_verify_token, access_token, iterations)
+    single_pass = measure("codec (no cache)", uncached.decode, access_token, iterations)
+    with_cache = measure("codec (LRU hit)", cached.decode, access_token, iterations)
+
+    print("=" * 60)
+    print(f"🚀 Single-pass speedup: {single_pass / baseline:.2f}x")
+    print(f"🚀 Cached speedup:      {with_cache / baseline:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+-- Migration: Full-text search over deceased profiles
+-- Date: 2026-10-17
+-- Description: Maintain deceased_profiles.search_vector with a trigger and index it with GIN
+
+-- Names rank above everything else (A), alternate names next (B),
+-- then biography and life details (C, D). The 'simple' configuration
+-- tokenizes without stemming, which suits Vietnamese syllables.
+CREATE OR REPLACE FUNCTION deceased_profiles_search_vector(p deceased_profiles) RETURNS tsvector AS $$
+    SELECT
+        setweight(to_tsvector('simple', concat_ws(' ', p.vietnamese_name, p.common_name, p.english_name)), 'A') ||
+        setweight(to_tsvector('simple', concat_ws(' ', p.first_name, p.middle_name, p.last_name,
+                                                   p.nickname, p.generation_name, p.ancestral_title)), 'B') ||
+        setweight(to_tsvector('simple', coalesce(p.biography, '')), 'C') ||
+        setweight(to_tsvector('simple', concat_ws(' ', p.life_achievements, p.occupation,
+                                                   p.birth_place, p.death_place)), 'D');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION deceased_profiles_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := deceased_profiles_search_vector(NEW);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS deceased_profiles_search_vector_trigger ON deceased_profiles;
+
+CREATE TRIGGER deceased_profiles_search_vector_trigger
+BEFORE INSERT OR UPDATE OF vietnamese_name, common_name, english_name, first_name, middle_name,
+    last_name, nickname, generation_name, ancestral_title, biography, life_achievements,
+    occupation, birth_place, death_place
+ON deceased_profiles
+FOR EACH ROW EXECUTE FUNCTION deceased_profiles_search_vector_update();
+
+-- Backfill existing rows in batches by id, committing after each so row
+-- locks stay short and vacuum can reclaim old versions as it goes. Only
+-- search_vector is written, so the trigger above does not fire; rows that
+-- are already up to date are skipped. Run outside of a transaction block.
+DO $$
+DECLARE
+    batch_size CONSTANT integer := 5000;
+    last_id uuid := '00000000-0000-0000-0000-000000000000';
+    batch_ids uuid[];
+BEGIN
+    LOOP
+        SELECT array_agg(id ORDER BY id) INTO batch_ids
+        FROM (
+            SELECT id FROM deceased_profiles
+            WHERE id > last_id
+            ORDER BY id
+            LIMIT batch_size
+        ) batch;
+        EXIT WHEN batch_ids IS NULL;
+
+        UPDATE deceased_profiles p
+        SET search_vector = deceased_profiles_search_vector(p)
+        WHERE p.id = ANY(batch_ids)
+          AND p.search_vector IS DISTINCT FROM deceased_profiles_search_vector(p);
+
+        last_id := batch_ids[array_length(batch_ids, 1)];
+        COMMIT;
+    END LOOP;
+END $$;
+
+-- CONCURRENTLY avoids blocking writes; run outside of a transaction block
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_deceased_profiles_search_vector
+ON deceased_profiles USING GIN (search_vector);
@@ -0,0 +1,7 @@
+-- Migration: Composite index for keyset pagination of deceased profiles
+-- Date: 2026-10-17
+-- Description: Support cursor pagination on (created_at, id) in GET /api/deceased/
+
+-- CONCURRENTLY avoids blocking writes; run outside of a transaction block
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_deceased_profiles_created_at_id
+ON deceased_profiles (created_at DESC, id DESC);
@@ -0,0 +1,50 @@
+-- Migration: Diacritic-insensitive name search for deceased profiles
+-- Date: 2026-10-17
+-- Description: Normalized search_name column with pg_trgm index for prefix and fuzzy lookups
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+ALTER TABLE deceased_profiles
+ADD COLUMN IF NOT EXISTS search_name TEXT;
+
+-- Backfill existing rows in batches by id, committing after each so row
+-- locks stay short and vacuum can reclaim old versions as it goes. New
+-- writes are normalized in Python by app.core.vietnamese.build_search_name
+-- (lowercase, no diacritics, đ -> d, single spaces), which this expression
+-- mirrors for Vietnamese text. Run outside of a transaction block.
+DO $$
+DECLARE
+    batch_size CONSTANT integer := 5000;
+    last_id uuid := '00000000-0000-0000-0000-000000000000';
+    batch_ids uuid[];
+BEGIN
+    LOOP
+        SELECT array_agg(id ORDER BY id) INTO batch_ids
+        FROM (
+            SELECT id FROM deceased_profiles
+            WHERE id > last_id
+            ORDER BY id
+            LIMIT batch_size
+        ) batch;
+        EXIT WHEN batch_ids IS NULL;
+
+        UPDATE deceased_profiles
+        SET search_name = NULLIF(
+            lower(trim(regexp_replace(
+                unaccent(translate(concat_ws(' ', vietnamese_name, common_name, english_name), 'đĐ', 'dD')),
+                '\s+', ' ', 'g'
+            ))),
+            ''
+        )
+        WHERE id = ANY(batch_ids)
+          AND search_name IS NULL;
+
+        last_id := batch_ids[array_length(batch_ids, 1)];
+        COMMIT;
+    END LOOP;
+END $$;
+
+-- CONCURRENTLY avoids blocking writes; run outside of a transaction block
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_deceased_profiles_search_name_trgm
+ON deceased_profiles USING GIN (search_name gin_trgm_ops);
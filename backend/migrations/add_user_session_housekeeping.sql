@@ -0,0 +1,36 @@
+-- Migration: Session housekeeping
+-- Date: 2026-10-17
+-- Description: Indexes for active-session lookups and batched expiry, plus an archive table for removed sessions
+
+-- Sessions moved out of user_sessions when SESSION_ARCHIVE_ENABLED is on
+CREATE TABLE IF NOT EXISTS user_sessions_archive (
+    id UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    token_hash VARCHAR(255) NOT NULL,
+    refresh_token_hash VARCHAR(255),
+    ip_address INET,
+    user_agent TEXT,
+    device_info JSONB,
+    created_at TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    last_used_at TIMESTAMP,
+    is_active BOOLEAN,
+    revoked_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_user_sessions_archive_user_id ON user_sessions_archive (user_id);
+
+-- CONCURRENTLY avoids blocking writes; run outside of a transaction block
+
+-- Auth lookups by id only ever want active sessions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_sessions_active_id
+ON user_sessions (id) WHERE is_active;
+
+-- logout_all_sessions and /api/auth/sessions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_sessions_user_active_expires
+ON user_sessions (user_id, is_active, expires_at);
+
+-- Housekeeping deletes expired sessions in expiry order
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_sessions_expires_at
+ON user_sessions (expires_at);
@@ -0,0 +1,10 @@
+-- Migration: Refresh token rotation
+-- Date: 2026-10-17
+-- Description: Remember the previous refresh token hash so concurrent refreshes can be told apart from token reuse
+
+ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS previous_refresh_token_hash VARCHAR(255);
+ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS refresh_rotated_at TIMESTAMP;
+
+-- Housekeeping copies every user_sessions column into the archive
+ALTER TABLE user_sessions_archive ADD COLUMN IF NOT EXISTS previous_refresh_token_hash VARCHAR(255);
+ALTER TABLE user_sessions_archive ADD COLUMN IF NOT EXISTS refresh_rotated_at TIMESTAMP;
@@ -0,0 +1,31 @@
+-- Migration: Session revocation timestamps
+-- Date: 2026-10-17
+-- Description: Record when a session was deactivated so stateless access tokens can be revoked incrementally
+
+ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS revoked_at TIMESTAMP;
+
+-- Stamp revoked_at whenever a session is deactivated, including by code
+-- paths that only flip is_active
+CREATE OR REPLACE FUNCTION user_sessions_revoked_at_update() RETURNS trigger AS $$
+BEGIN
+    IF OLD.is_active IS DISTINCT FROM FALSE AND NEW.is_active = FALSE THEN
+        NEW.revoked_at := COALESCE(NEW.revoked_at, now() AT TIME ZONE 'utc');
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_sessions_revoked_at_trigger ON user_sessions;
+
+CREATE TRIGGER user_sessions_revoked_at_trigger
+BEFORE UPDATE OF is_active ON user_sessions
+FOR EACH ROW EXECUTE FUNCTION user_sessions_revoked_at_update();
+
+-- Backfill sessions that were deactivated before this migration
+UPDATE user_sessions
+SET revoked_at = COALESCE(last_used_at, now() AT TIME ZONE 'utc')
+WHERE is_active = FALSE AND revoked_at IS NULL;
+
+-- CONCURRENTLY avoids blocking writes; run outside of a transaction block
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_sessions_revoked_at
+ON user_sessions (revoked_at) WHERE revoked_at IS NOT NULL;
@@ -0,0 +1,80 @@
+"""
+Joined auth lookup tests
+AuthService.get_session_with_user issues one session + user query and
+splits the row into snapshots (no database needed)
+"""
+
+from datetime import datetime
+import asyncio
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.session_cache import SESSION_SNAPSHOT_FIELDS, USER_SNAPSHOT_FIELDS
+from app.services.auth_service import AuthService
+
+
+class Result:
+    def __init__(self, row):
+        self.row = row
+
+    def mappings(self):
+        return self
+
+    def one_or_none(self):
+        return self.row
+
+
+class RecordingSession:
+    """Returns a canned row and records the statements it was given"""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return Result(self.row)
+
+
+def joined_row(session_id, user_id):
+    row = {f"session__{name}": f"session-{name}" for name in SESSION_SNAPSHOT_FIELDS}
+    row.update({f"user__{name}": f"user-{name}" for name in USER_SNAPSHOT_FIELDS})
+    row.update({"session__id": session_id, "session__user_id": user_id, "user__id": user_id})
+    return row
+
+
+def test_lookup_is_one_joined_query():
+    session_id = uuid.uuid4()
+    db = RecordingSession(joined_row(session_id, uuid.uuid4()))
+
+    asyncio.run(AuthService(db).get_session_with_user(session_id))
+
+    assert len(db.statements) == 1
+    compiled = db.statements[0].compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "JOIN users ON users.id = user_sessions.user_id" in sql
+    assert "user_sessions.is_active = true" in sql
+    assert "user_sessions.expires_at >" in sql
+    assert "password_hash" not in sql
+    assert session_id in compiled.params.values()
+
+
+def test_lookup_splits_row_into_snapshots():
+    session_id, user_id = uuid.uuid4(), uuid.uuid4()
+    db = RecordingSession(joined_row(session_id, user_id))
+
+    session, user = asyncio.run(AuthService(db).get_session_with_user(session_id))
+
+    assert set(session) == set(SESSION_SNAPSHOT_FIELDS)
+    assert set(user) == set(USER_SNAPSHOT_FIELDS)
+    assert session["id"] == session_id
+    assert session["user_id"] == user["id"] == user_id
+    assert user["email"] == "user-email"
+    assert session["expires_at"] == "session-expires_at"
+
+
+def test_lookup_returns_none_for_inactive_or_missing_session():
+    db = RecordingSession(None)
+
+    assert asyncio.run(AuthService(db).get_session_with_user(uuid.uuid4())) is None
@@ -0,0 +1,79 @@
+"""
+Background worker tests
+Start/stop lifecycle and failure handling of the shared loop (no database needed)
+"""
+
+import asyncio
+
+from app.core.background import BackgroundWorker
+
+
+class Worker(BackgroundWorker):
+    failure_message = "Test step failed"
+
+    def __init__(self, fail_every: int = 0):
+        super().__init__()
+        self.interval = 0
+        self.fail_every = fail_every
+        self.steps = 0
+
+    async def run_once(self) -> None:
+        self.steps += 1
+        if self.fail_every and self.steps % self.fail_every == 0:
+            raise RuntimeError("boom")
+
+
+async def spin(rounds: int = 20) -> None:
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+def test_start_runs_steps_until_stopped():
+    async def scenario():
+        worker = Worker()
+        assert not worker.running
+
+        worker.start()
+        await spin()
+        assert worker.running
+        await worker.stop()
+        steps = worker.steps
+        await spin()
+
+        assert steps > 1
+        assert worker.steps == steps
+        assert not worker.running
+
+    asyncio.run(scenario())
+
+
+def test_start_twice_keeps_one_loop():
+    async def scenario():
+        worker = Worker()
+        worker.start()
+        task = worker._task
+        worker.start()
+
+        assert worker._task is task
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failed_steps_are_counted_and_loop_continues(caplog):
+    async def scenario():
+        worker = Worker(fail_every=2)
+        worker.start()
+        await spin()
+        await worker.stop()
+        return worker
+
+    worker = asyncio.run(scenario())
+
+    assert worker.steps > 4
+    assert worker.errors == worker.steps // 2
+    assert "Test step failed: boom" in caplog.text
+
+
+def test_stop_without_start_is_a_no_op():
+    asyncio.run(Worker().stop())
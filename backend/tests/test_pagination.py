@@ -0,0 +1,79 @@
+"""
+Keyset cursor tests
+encode_cursor/decode_cursor round trips and rejection of malformed
+cursors (no database needed)
+"""
+
+from datetime import datetime
+import base64
+import uuid
+
+import pytest
+
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 3, 15, 8, 30, 0),
+    datetime(2024, 3, 15, 8, 30, 0, 123456),
+    datetime(1999, 12, 31, 23, 59, 59, 1),
+])
+def test_round_trip(created_at):
+    row_id = uuid.uuid4()
+
+    cursor = encode_cursor(created_at, row_id)
+
+    assert decode_cursor(cursor) == (created_at, row_id)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    "é",
+    "a",
+    raw_cursor(b"\xff\xfe\xfd"),
+    raw_cursor(b"not json"),
+    raw_cursor(b"[" * 5000),
+], ids=["empty", "bad-base64", "non-ascii", "truncated", "not-utf8", "not-json", "deep-nesting"])
+def test_bad_encoding_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"created_at": "2024-03-15T08:30:00", "id": "x"}',
+    b'"2024-03-15T08:30:00"',
+    b"42",
+    b"null",
+    b"NaN",
+    b"[]",
+    b'["2024-03-15T08:30:00"]',
+    b'["2024-03-15T08:30:00", "4b0c5d3e-0f4e-4a61-9d2c-7f7f2f0b8a11", "extra"]',
+    b'["2024-03-15T08:30:00", 5]',
+    b'[1710491400, "4b0c5d3e-0f4e-4a61-9d2c-7f7f2f0b8a11"]',
+    b'[null, null]',
+    b'[["2024-03-15T08:30:00"], "4b0c5d3e-0f4e-4a61-9d2c-7f7f2f0b8a11"]',
+], ids=[
+    "object", "string", "number", "null", "nan", "empty-list", "one-item", "three-items",
+    "int-id", "int-date", "nulls", "nested",
+])
+def test_wrong_json_shape_raises_value_error(raw):
+    with pytest.raises(ValueError):
+        decode_cursor(raw_cursor(raw))
+
+
+@pytest.mark.parametrize("raw", [
+    b'["2024-03-15T08:30:00", "not-a-uuid"]',
+    b'["2024-03-15T08:30:00", ""]',
+    b'["2024-13-45T08:30:00", "4b0c5d3e-0f4e-4a61-9d2c-7f7f2f0b8a11"]',
+    b'["yesterday", "4b0c5d3e-0f4e-4a61-9d2c-7f7f2f0b8a11"]',
+    b'["", "4b0c5d3e-0f4e-4a61-9d2c-7f7f2f0b8a11"]',
+], ids=["bad-uuid", "empty-uuid", "bad-date", "word-date", "empty-date"])
+def test_bad_uuid_or_date_raises_value_error(raw):
+    with pytest.raises(ValueError):
+        decode_cursor(raw_cursor(raw))
@@ -0,0 +1,246 @@
+"""
+Rate limiter tests
+Sliding-window, token-bucket and shared-store backends, key eviction,
+email keys and RateLimitMiddleware's body replay (no server needed)
+"""
+
+from types import SimpleNamespace
+import asyncio
+
+import pytest
+import orjson
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    LocalCounterStore, RateLimiter, RateLimitMiddleware, SharedStoreBackend,
+    SlidingWindowBackend, TokenBucketBackend, _email_from_body
+)
+
+
+WINDOW = 60.0
+
+
+class Clock:
+    """Stands in for time.monotonic and time.time inside the rate limiter"""
+
+    def __init__(self, now=6000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 6000 is the start of a 60 second window
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+def hits(backend, key, count, limit):
+    async def run():
+        return [await backend.hit(key, limit, WINDOW) for _ in range(count)]
+    return asyncio.run(run())
+
+
+def test_sliding_window_limits_within_a_window(clock):
+    backend = SlidingWindowBackend()
+
+    results = hits(backend, "k", 4, limit=3)
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after == pytest.approx(WINDOW)
+
+
+def test_sliding_window_weights_the_previous_window(clock):
+    backend = SlidingWindowBackend()
+    hits(backend, "k", 3, limit=3)
+
+    # Halfway into the next window the previous 3 hits count as 1.5
+    clock.now += WINDOW * 1.5
+    results = hits(backend, "k", 3, limit=3)
+
+    assert [r.allowed for r in results] == [True, True, False]
+    # 3 * (1 - elapsed) + 2 < 3 once elapsed > 2/3, i.e. 10 seconds later
+    assert results[-1].retry_after == pytest.approx(10.0)
+
+    clock.now += 10.01
+    assert hits(backend, "k", 1, limit=3)[0].allowed
+
+
+def test_sliding_window_forgets_after_two_windows(clock):
+    backend = SlidingWindowBackend()
+    hits(backend, "k", 3, limit=3)
+
+    clock.now += WINDOW * 2
+
+    assert all(r.allowed for r in hits(backend, "k", 3, limit=3))
+
+
+def test_token_bucket_allows_burst_then_refills(clock):
+    backend = TokenBucketBackend()
+
+    results = hits(backend, "k", 3, limit=2)
+
+    assert [r.allowed for r in results] == [True, True, False]
+    # One token every window / limit = 30 seconds
+    assert results[-1].retry_after == pytest.approx(30.0)
+
+    clock.now += 15
+    assert hits(backend, "k", 1, limit=2)[0].retry_after == pytest.approx(15.0)
+
+    clock.now += 15
+    assert hits(backend, "k", 1, limit=2)[0].allowed
+
+
+def test_shared_backend_limits_across_windows(clock):
+    backend = SharedStoreBackend(LocalCounterStore())
+
+    results = hits(backend, "k", 3, limit=2)
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert [r.remaining for r in results] == [1, 0, 0]
+    assert results[-1].retry_after == pytest.approx(WINDOW)
+
+    # The previous window's 3 hits still weigh 1.5 halfway through
+    clock.now += WINDOW * 1.5
+    result = hits(backend, "k", 1, limit=2)[0]
+    assert not result.allowed
+    assert result.retry_after == pytest.approx(WINDOW / 2)
+
+
+def test_local_backend_drops_least_recently_hit_keys_past_capacity(clock):
+    backend = SlidingWindowBackend(max_keys=10)
+    for i in range(10):
+        hits(backend, f"k{i}", 1, limit=5)
+    hits(backend, "k0", 1, limit=5)  # k0 becomes most recently hit
+
+    hits(backend, "k10", 1, limit=5)
+
+    assert backend.size() == backend.low_water == 9
+    assert "k0" in backend._state and "k10" in backend._state
+    assert "k1" not in backend._state and "k2" not in backend._state
+
+
+def test_local_backend_prunes_stale_keys(clock):
+    backend = TokenBucketBackend()
+    for i in range(5):
+        hits(backend, f"k{i}", 1, limit=5)
+
+    clock.now += WINDOW
+    hits(backend, "fresh", 1, limit=5)
+
+    assert list(backend._state) == ["fresh"]
+
+
+def test_counter_store_expires_and_trims(clock):
+    store = LocalCounterStore(max_counters=10)
+
+    async def fill():
+        for i in range(10):
+            await store.incr(f"k{i}", WINDOW)
+        clock.now += WINDOW
+        await store.incr("late", WINDOW)
+        assert store.size() == 1
+
+        for i in range(10):
+            await store.incr(f"n{i}", WINDOW)
+        assert store.size() == store.low_water == 9
+        assert await store.get("n9") == 1
+
+    asyncio.run(fill())
+
+
+@pytest.mark.parametrize("body, email", [
+    (b'{"email": "  User@Example.COM ", "password": "x"}', "user@example.com"),
+    (b'{"email": ""}', None),
+    (b'{"email": 42}', None),
+    (b'["user@example.com"]', None),
+    (b'not json', None),
+    (b'', None),
+    (orjson.dumps({"email": "a" * 250 + "@x.vn"}), None),
+    (orjson.dumps({"email": "a" * 245 + "@x.vn"}), "a" * 245 + "@x.vn"),
+])
+def test_email_from_body(body, email):
+    assert _email_from_body(body) == email
+
+
+async def echo(request: Request):
+    return Response(await request.body(), media_type="application/json")
+
+
+def client_for(ip_limit=100, email_limit=100):
+    limiter = RateLimiter(
+        backend=SlidingWindowBackend(),
+        ip_limit=ip_limit,
+        email_limit=email_limit,
+        window=WINDOW,
+        paths=["/login"],
+    )
+    app = Starlette(routes=[
+        Route("/login", echo, methods=["POST"]),
+        Route("/other", echo, methods=["POST"]),
+    ])
+    return TestClient(RateLimitMiddleware(app, limiter)), limiter
+
+
+def test_middleware_replays_the_inspected_body(clock):
+    client, limiter = client_for()
+    body = orjson.dumps({"email": "user@example.com", "password": "secret"})
+
+    response = client.post("/login", content=body)
+
+    assert response.status_code == 200
+    assert response.content == body
+    assert limiter.allowed == 1
+
+
+def test_middleware_replays_bodies_too_large_to_inspect(clock):
+    client, _ = client_for()
+    body = orjson.dumps({"email": "user@example.com", "bio": "x" * rate_limit.MAX_INSPECTED_BODY_BYTES})
+
+    response = client.post("/login", content=body)
+
+    assert response.status_code == 200
+    assert response.content == body
+
+
+def test_middleware_limits_by_email(clock):
+    client, limiter = client_for(email_limit=2)
+    body = orjson.dumps({"email": "user@example.com"})
+
+    statuses = [client.post("/login", content=body).status_code for _ in range(3)]
+    other = client.post("/login", content=orjson.dumps({"email": "other@example.com"}))
+
+    assert statuses == [200, 200, 429]
+    assert other.status_code == 200
+    assert limiter.limited_email == 1
+
+
+def test_middleware_rejects_with_retry_headers(clock):
+    client, limiter = client_for(ip_limit=1)
+    client.post("/login", content=b"{}")
+
+    response = client.post("/login", content=b"{}")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    assert response.headers["X-RateLimit-Limit"] == "1"
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+    assert limiter.limited_ip == 1
+
+
+def test_middleware_ignores_other_paths(clock):
+    client, limiter = client_for(ip_limit=1)
+
+    statuses = [client.post("/other", content=b"{}").status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 200]
+    assert limiter.allowed == 0
@@ -0,0 +1,217 @@
+"""
+Refresh token rotation tests
+Compare-and-swap rotation, concurrent refreshes and reuse detection in
+AuthService.refresh_token, against an in-memory stand-in for the
+user_sessions table (no database needed)
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import asyncio
+import hashlib
+import secrets
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.revocation import revocation_list
+from app.core.security import create_refresh_token
+from app.core.session_cache import SESSION_SNAPSHOT_FIELDS, USER_SNAPSHOT_FIELDS
+from app.services.auth_service import AuthService
+
+
+def token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class Result:
+    def __init__(self, row=None):
+        self.row = row
+
+    def mappings(self):
+        return self
+
+    def one_or_none(self):
+        return self.row
+
+
+class FakeSessionStore:
+    """
+    One user with one session, updated the way the real statements would
+
+    execute() yields to the event loop first, so concurrent refreshes
+    interleave between statements while each statement stays atomic.
+    """
+
+    def __init__(self, expires_in=timedelta(days=7)):
+        now = datetime.utcnow()
+        self.user = {name: None for name in USER_SNAPSHOT_FIELDS}
+        self.user.update(
+            id=uuid.uuid4(),
+            email="user@example.com",
+            first_name="Test",
+            last_name="User",
+            email_verified=True,
+            language="vi",
+            timezone="Asia/Ho_Chi_Minh",
+            notification_preferences={},
+            privacy_settings={},
+            created_at=now,
+            updated_at=now,
+        )
+        self.session = {name: None for name in SESSION_SNAPSHOT_FIELDS}
+        self.session.update(
+            id=uuid.uuid4(),
+            user_id=self.user["id"],
+            device_info={},
+            created_at=now,
+            expires_at=now + expires_in,
+            last_used_at=now,
+            is_active=True,
+            revoked_at=None,
+            previous_refresh_token_hash=None,
+            refresh_rotated_at=None,
+        )
+        self.token = self.issue_token()
+        self.session["refresh_token_hash"] = token_hash(self.token)
+        self.commits = 0
+
+    def issue_token(self):
+        return create_refresh_token(
+            data={
+                "user_id": str(self.user["id"]),
+                "session_id": str(self.session["id"]),
+                "jti": secrets.token_urlsafe(8),
+            },
+            expires_delta=timedelta(days=7),
+        )
+
+    async def execute(self, statement):
+        await asyncio.sleep(0)
+        compiled = statement.compile()
+        params = compiled.params
+        if statement.is_update and compiled.returning:
+            return self._rotate(params)
+        if statement.is_update:
+            return self._revoke(params)
+        return Result(SimpleNamespace(**self.session) if params["id_1"] == self.session["id"] else None)
+
+    def _rotate(self, params):
+        session = self.session
+        if (
+            params["id_1"] != session["id"]
+            or params["refresh_token_hash_1"] != session["refresh_token_hash"]
+            or not session["is_active"]
+            or session["expires_at"] <= params["expires_at_1"]
+        ):
+            return Result(None)
+        session.update({name: value for name, value in params.items() if name in session})
+        row = {f"session__{name}": session[name] for name in SESSION_SNAPSHOT_FIELDS}
+        row.update({f"user__{name}": self.user[name] for name in USER_SNAPSHOT_FIELDS})
+        return Result(row)
+
+    def _revoke(self, params):
+        if params["id_1"] == self.session["id"] and self.session["is_active"]:
+            self.session.update(is_active=params["is_active"], revoked_at=params["revoked_at"])
+        return Result(None)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+def refresh(store, token):
+    return AuthService(store).refresh_token(token)
+
+
+def test_refresh_rotates_the_stored_hash():
+    store = FakeSessionStore()
+
+    tokens = asyncio.run(refresh(store, store.token))
+
+    assert tokens.refresh_token != store.token
+    assert store.session["refresh_token_hash"] == token_hash(tokens.refresh_token)
+    assert store.session["previous_refresh_token_hash"] == token_hash(store.token)
+    assert store.session["refresh_rotated_at"] is not None
+
+    # The new token rotates again
+    assert asyncio.run(refresh(store, tokens.refresh_token)).refresh_token != tokens.refresh_token
+
+
+def test_concurrent_double_refresh_gets_409_inside_grace():
+    store = FakeSessionStore()
+
+    async def both():
+        return await asyncio.gather(
+            refresh(store, store.token),
+            refresh(store, store.token),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(both())
+
+    winners = [r for r in results if not isinstance(r, Exception)]
+    losers = [r for r in results if isinstance(r, Exception)]
+    assert len(winners) == 1 and len(losers) == 1
+    assert isinstance(losers[0], HTTPException) and losers[0].status_code == 409
+    # The loser did not revoke anything; the winner's token keeps working
+    assert store.session["is_active"]
+    assert store.session["refresh_token_hash"] == token_hash(winners[0].refresh_token)
+    asyncio.run(refresh(store, winners[0].refresh_token))
+
+
+def test_reuse_after_grace_revokes_session():
+    store = FakeSessionStore()
+    rotated = asyncio.run(refresh(store, store.token))
+    store.session["refresh_rotated_at"] -= timedelta(hours=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(refresh(store, store.token))
+
+    assert exc_info.value.status_code == 401
+    assert "reuse" in exc_info.value.detail
+    assert store.session["is_active"] is False
+    assert store.session["revoked_at"] is not None
+    assert store.session["id"].bytes in revocation_list._filter
+
+    # The legitimate holder's token dies with the session
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(refresh(store, rotated.refresh_token))
+    assert exc_info.value.status_code == 401
+
+
+def test_unknown_superseded_token_is_reuse():
+    store = FakeSessionStore()
+    asyncio.run(refresh(store, store.token))
+
+    # Validly signed for this session, but neither current nor just rotated
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(refresh(store, store.issue_token()))
+
+    assert exc_info.value.status_code == 401
+    assert store.session["is_active"] is False
+
+
+def test_expired_session_is_rejected_without_revoking():
+    store = FakeSessionStore(expires_in=timedelta(seconds=-1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(refresh(store, store.token))
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Session not found or expired"
+    assert store.session["is_active"] is True
+    assert store.session["revoked_at"] is None
+
+
+def test_invalid_token_is_rejected():
+    store = FakeSessionStore()
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(refresh(store, "not-a-token"))
+
+    assert exc_info.value.status_code == 401
+    assert store.commits == 0
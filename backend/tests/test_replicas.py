@@ -0,0 +1,54 @@
+"""
+Primary pin tests
+Signed client pins and read routing while pinned (no database needed)
+"""
+
+from types import SimpleNamespace
+import time
+
+from app.core.replicas import (
+    PIN_COOKIE, PIN_HEADER, ReplicaRouter, client_pin_until, encode_pin, pin_key
+)
+
+
+KEY = pin_key("server-secret")
+PIN_SECONDS = 5.0
+
+
+def engine(name):
+    return SimpleNamespace(sync_engine=name, url=SimpleNamespace(host=name))
+
+
+def test_signed_pin_round_trips_from_header_or_cookie():
+    until = time.time() + 2
+
+    from_header = client_pin_until({PIN_HEADER: encode_pin(until, KEY)}, {}, KEY, PIN_SECONDS)
+    from_cookie = client_pin_until({}, {PIN_COOKIE: encode_pin(until, KEY)}, KEY, PIN_SECONDS)
+
+    assert from_header == from_cookie == round(until, 3)
+
+
+def test_unsigned_or_forged_pins_are_ignored():
+    until = time.time() + 2
+    forged = encode_pin(until, pin_key("other-secret"))
+    tampered = encode_pin(until, KEY).replace(f"{until:.3f}", f"{until + 1e9:.3f}")
+
+    for value in ("1e12", f"{until:.3f}", forged, tampered, "", "nan.abc", "."):
+        assert client_pin_until({PIN_HEADER: value}, {}, KEY, PIN_SECONDS) is None
+
+
+def test_pin_is_clamped_to_pin_seconds():
+    far_future = encode_pin(time.time() + 3600, KEY)
+
+    until = client_pin_until({PIN_HEADER: far_future}, {}, KEY, PIN_SECONDS)
+
+    assert until <= time.time() + PIN_SECONDS
+
+
+def test_client_pin_routes_reads_to_primary():
+    router = ReplicaRouter(primary=engine("primary"), replicas=[engine("replica")], pin_seconds=PIN_SECONDS)
+
+    assert router.read_bind(None) == "replica"
+    assert router.read_bind(None, time.time() + 1) == "primary"
+    assert router.read_bind(None, time.time() - 1) == "replica"
+    assert router.pinned_reads == 1
@@ -0,0 +1,134 @@
+"""
+Revocation list tests
+BloomFilter accuracy and RevocationList's incremental refresh against an
+in-memory stand-in for user_sessions (no database needed)
+"""
+
+from datetime import datetime, timedelta
+import asyncio
+import uuid
+
+from app.core.revocation import BloomFilter, RevocationList
+
+
+class InMemoryRevocationList(RevocationList):
+    """RevocationList reading (session id, revoked_at) rows from a list"""
+
+    def __init__(self, rows, **kwargs):
+        super().__init__(
+            refresh_interval=kwargs.get("refresh_interval", 5.0),
+            rebuild_interval=kwargs.get("rebuild_interval", 300.0),
+            capacity=kwargs.get("capacity", 1000),
+            error_rate=kwargs.get("error_rate", 0.001),
+        )
+        self.rows = rows
+        self.queries = []
+
+    async def _load_since(self, since):
+        self.queries.append(since)
+        return [(session_id, revoked_at) for session_id, revoked_at in self.rows if revoked_at > since]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    keys = [uuid.uuid4().bytes for _ in range(10000)]
+
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+
+
+def test_bloom_filter_false_positive_rate_near_configured():
+    error_rate = 0.01
+    bloom = BloomFilter(capacity=10000, error_rate=error_rate)
+    for _ in range(10000):
+        bloom.add(uuid.uuid4().bytes)
+
+    probes = 50000
+    false_positives = sum(uuid.uuid4().bytes in bloom for _ in range(probes))
+
+    # Expected ~500; allow generous slack for randomness
+    assert false_positives / probes < error_rate * 2
+
+
+def test_bloom_filter_add_reports_new_keys():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    key = uuid.uuid4().bytes
+
+    assert bloom.add(key)
+    assert not bloom.add(key)
+    assert bloom.count == 1
+
+
+def test_first_refresh_rebuilds_from_horizon():
+    now = datetime.utcnow()
+    revoked = uuid.uuid4()
+    revocations = InMemoryRevocationList([(revoked, now - timedelta(minutes=1))])
+
+    assert revocations.might_be_revoked(uuid.uuid4())  # not fresh yet
+
+    assert asyncio.run(revocations.refresh()) == 1
+    assert revocations.rebuilds == 1
+    assert revocations.fresh
+    assert revocations.might_be_revoked(revoked)
+    assert not revocations.might_be_revoked(uuid.uuid4())
+
+
+def test_refresh_reads_from_watermark_minus_overlap():
+    now = datetime.utcnow()
+    first = (uuid.uuid4(), now - timedelta(seconds=30))
+    revocations = InMemoryRevocationList([first])
+    asyncio.run(revocations.refresh())
+
+    late = (uuid.uuid4(), now - timedelta(seconds=45))  # committed late, older stamp
+    newer = (uuid.uuid4(), now)
+    revocations.rows += [late, newer]
+
+    assert asyncio.run(revocations.refresh()) == 3
+    assert revocations.queries[-1] == first[1] - RevocationList.OVERLAP
+    assert revocations.refreshes == 1
+    assert revocations.might_be_revoked(late[0])
+    assert revocations.might_be_revoked(newer[0])
+
+    # Watermark advanced to the newest revocation seen
+    asyncio.run(revocations.refresh())
+    assert revocations.queries[-1] == newer[1] - RevocationList.OVERLAP
+
+
+def test_refresh_misses_rows_older_than_overlap():
+    now = datetime.utcnow()
+    revocations = InMemoryRevocationList([(uuid.uuid4(), now)])
+    asyncio.run(revocations.refresh())
+
+    too_late = (uuid.uuid4(), now - RevocationList.OVERLAP - timedelta(seconds=1))
+    revocations.rows.append(too_late)
+    asyncio.run(revocations.refresh())
+
+    # Picked up by the next full rebuild instead
+    assert not revocations.might_be_revoked(too_late[0])
+    asyncio.run(revocations.rebuild())
+    assert revocations.might_be_revoked(too_late[0])
+
+
+def test_local_add_is_immediate():
+    revocations = InMemoryRevocationList([])
+    asyncio.run(revocations.refresh())
+    session_id = uuid.uuid4()
+
+    revocations.add([session_id])
+
+    assert revocations.might_be_revoked(session_id)
+
+
+def test_refresh_over_capacity_rebuilds_larger_filter():
+    now = datetime.utcnow()
+    revocations = InMemoryRevocationList([], capacity=10)
+    asyncio.run(revocations.refresh())
+
+    revocations.rows += [(uuid.uuid4(), now) for _ in range(25)]
+    asyncio.run(revocations.refresh())
+
+    assert revocations.rebuilds == 2
+    assert revocations._filter.capacity >= 50
+    assert all(revocations.might_be_revoked(session_id) for session_id, _ in revocations.rows)
@@ -0,0 +1,143 @@
+"""
+Session activity writer tests
+Coalescing, chunked flushes, retry buffering and shutdown mid-flush,
+against a fake session factory (no database needed)
+"""
+
+from datetime import datetime, timedelta
+import asyncio
+import uuid
+
+import pytest
+
+from app.core import session_activity
+from app.core.session_activity import SessionActivityWriter
+
+
+class FakeDatabase:
+    """
+    Records the session ids each UPDATE ... FROM (VALUES ...) commits
+
+    ``fail`` makes executes raise; ``block`` makes them wait until the
+    writer is cancelled.
+    """
+
+    def __init__(self):
+        self.written = []
+        self.statements = 0
+        self.fail = False
+        self.block = False
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+        self.session_ids = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        if self.database.fail:
+            raise ConnectionError("database unavailable")
+        if self.database.block:
+            await asyncio.Event().wait()
+        params = statement.compile().params
+        self.session_ids = [value for value in params.values() if isinstance(value, uuid.UUID)]
+        self.database.statements += 1
+
+    async def commit(self):
+        self.database.written.extend(self.session_ids)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(session_activity, "AsyncSessionLocal", database)
+    return database
+
+
+def writer(**kwargs):
+    options = {"flush_interval": 60.0, "max_pending": 100, "max_buffered": 1000}
+    options.update(kwargs)
+    return SessionActivityWriter(**options)
+
+
+def test_touch_keeps_newest_timestamp_per_session():
+    activity = writer()
+    session_id = uuid.uuid4()
+    now = datetime.utcnow()
+
+    activity.touch(session_id, now)
+    activity.touch(session_id, now - timedelta(seconds=5))
+    activity.touch(session_id, now + timedelta(seconds=5))
+
+    assert activity._pending == {session_id: now + timedelta(seconds=5)}
+    assert activity.touches == 3
+
+
+def test_touch_drops_earliest_session_when_buffer_full():
+    activity = writer(max_pending=2, max_buffered=2)
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    for session_id in (first, second, third):
+        activity.touch(session_id)
+
+    assert list(activity._pending) == [second, third]
+    assert activity.dropped == 1
+
+
+def test_flush_writes_in_chunks(database):
+    activity = writer(max_pending=3)
+    for _ in range(7):
+        activity.touch(uuid.uuid4())
+
+    assert asyncio.run(activity.flush()) == 7
+    assert database.statements == 3
+    assert len(set(database.written)) == activity.rows_written == 7
+    assert activity._pending == {}
+
+
+def test_failed_flush_requeues_rows(database):
+    activity = writer()
+    session_ids = [uuid.uuid4() for _ in range(5)]
+    for session_id in session_ids:
+        activity.touch(session_id)
+    database.fail = True
+
+    assert asyncio.run(activity.flush()) == 0
+    assert set(activity._pending) == set(session_ids)
+    assert activity.flush_errors == 1
+
+    database.fail = False
+    assert asyncio.run(activity.flush()) == 5
+    assert set(database.written) == set(session_ids)
+
+
+def test_stop_mid_flush_keeps_rows_for_final_flush(database):
+    activity = writer(max_pending=2)
+    session_ids = [uuid.uuid4() for _ in range(5)]
+
+    async def shutdown_during_flush():
+        activity.start()
+        database.block = True
+        for session_id in session_ids:
+            activity.touch(session_id)
+        # Let the loop wake up and block inside the first chunk
+        while not activity._flush_lock.locked():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        database.block = False
+        await activity.stop()
+
+    asyncio.run(shutdown_during_flush())
+
+    assert activity._pending == {}
+    assert set(database.written) == set(session_ids)
+    assert activity.rows_written == 5
@@ -0,0 +1,176 @@
+"""
+Session cache tests
+TTL expiry, LRU eviction, per-user invalidation and the access-token
+claims snapshot round-trip (no database needed)
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import uuid
+
+import pytest
+
+from app.core import session_cache as session_cache_module
+from app.core.session_cache import (
+    SessionCache, USER_SNAPSHOT_FIELDS, models_from_claims, snapshot_claims
+)
+
+
+class Clock:
+    """Stands in for time.monotonic inside the cache module"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_cache_module, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def snapshots(user_id=None, expires_in=timedelta(days=1)):
+    user = {name: None for name in USER_SNAPSHOT_FIELDS}
+    user.update(id=user_id or uuid.uuid4(), email="user@example.com")
+    session = {
+        "id": uuid.uuid4(),
+        "user_id": user["id"],
+        "expires_at": datetime.utcnow() + expires_in,
+        "is_active": True,
+    }
+    return session, user
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = SessionCache(max_entries=10, ttl_seconds=60)
+    session, user = snapshots()
+    cache.put(session, user)
+
+    clock.now += 59
+    assert cache.get(session["id"]).user["email"] == "user@example.com"
+
+    clock.now += 2
+    assert cache.get(session["id"]) is None
+    assert cache.stats.expirations == 1
+    assert cache.metrics()["size"] == 0
+
+
+def test_ttl_never_outlives_the_session(clock):
+    cache = SessionCache(max_entries=10, ttl_seconds=600)
+    session, user = snapshots(expires_in=timedelta(seconds=30))
+    cache.put(session, user)
+
+    clock.now += 31
+    assert cache.get(session["id"]) is None
+
+
+def test_expired_session_is_not_cached(clock):
+    cache = SessionCache(max_entries=10, ttl_seconds=60)
+    session, user = snapshots(expires_in=timedelta(seconds=-1))
+    cache.put(session, user)
+
+    assert cache.metrics()["size"] == 0
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = SessionCache(max_entries=2, ttl_seconds=60)
+    first, second, third = snapshots(), snapshots(), snapshots()
+    cache.put(*first)
+    cache.put(*second)
+
+    # Touch the first entry so the second becomes least recently used
+    assert cache.get(first[0]["id"]) is not None
+    cache.put(*third)
+
+    assert cache.get(second[0]["id"]) is None
+    assert cache.get(first[0]["id"]) is not None
+    assert cache.get(third[0]["id"]) is not None
+    assert cache.stats.evictions == 1
+
+
+def test_invalidate_user_drops_only_their_sessions(clock):
+    cache = SessionCache(max_entries=10, ttl_seconds=60)
+    user_id = uuid.uuid4()
+    mine = [snapshots(user_id) for _ in range(3)]
+    other = snapshots()
+    for session, user in mine + [other]:
+        cache.put(session, user)
+
+    cache.invalidate_user(user_id)
+
+    assert all(cache.get(session["id"]) is None for session, _ in mine)
+    assert cache.get(other[0]["id"]) is not None
+    assert cache.stats.invalidations == 3
+    assert user_id not in cache._user_sessions
+
+
+def test_invalidate_single_session(clock):
+    cache = SessionCache(max_entries=10, ttl_seconds=60)
+    user_id = uuid.uuid4()
+    kept, dropped = snapshots(user_id), snapshots(user_id)
+    cache.put(*kept)
+    cache.put(*dropped)
+
+    cache.invalidate(dropped[0]["id"])
+    cache.invalidate(dropped[0]["id"])  # already gone: not counted twice
+
+    assert cache.get(dropped[0]["id"]) is None
+    assert cache.get(kept[0]["id"]) is not None
+    assert cache.stats.invalidations == 1
+    assert cache._user_sessions[user_id] == {kept[0]["id"]}
+
+
+def test_disabled_cache_stores_nothing(clock):
+    cache = SessionCache(max_entries=10, ttl_seconds=60, enabled=False)
+    session, user = snapshots()
+    cache.put(session, user)
+
+    assert cache.get(session["id"]) is None
+    assert cache.metrics()["size"] == 0
+
+
+def test_claims_snapshot_round_trip():
+    now = datetime(2024, 3, 15, 8, 30, 0)
+    user = {name: None for name in USER_SNAPSHOT_FIELDS}
+    user.update(
+        id=uuid.uuid4(),
+        email="nguyen@example.com",
+        first_name="Nguyễn",
+        last_name="Văn A",
+        email_verified=True,
+        email_verified_at=now,
+        language="vi",
+        timezone="Asia/Ho_Chi_Minh",
+        notification_preferences={"email": True},
+        privacy_settings={"profile": "family"},
+        created_at=now - timedelta(days=30),
+        updated_at=now,
+    )
+    session_id = uuid.uuid4()
+    session_expires_at = now + timedelta(days=7)
+
+    claims = snapshot_claims(user, session_expires_at)
+    session, rebuilt = models_from_claims(claims, session_id)
+
+    for name in USER_SNAPSHOT_FIELDS:
+        assert getattr(rebuilt, name) == user[name], name
+    assert session.id == session_id
+    assert session.user_id == user["id"]
+    assert session.expires_at == session_expires_at
+    assert session.is_active is True
+
+
+def test_claims_snapshot_is_json_safe():
+    user = {name: None for name in USER_SNAPSHOT_FIELDS}
+    user.update(id=uuid.uuid4(), created_at=datetime.utcnow())
+
+    claims = snapshot_claims(user, datetime.utcnow())
+
+    assert isinstance(claims["usr"]["id"], str)
+    assert isinstance(claims["usr"]["created_at"], str)
+    assert isinstance(claims["sxp"], str)
+    assert "password_hash" not in claims["usr"]
@@ -0,0 +1,159 @@
+"""
+TokenCodec and keyring tests
+Signing with the active kid, verification across key rotation, legacy
+tokens without a kid, and algorithm confusion (no database needed)
+"""
+
+import time
+
+import pytest
+from jose import jws
+import orjson
+
+from app.core.config import Settings
+from app.core.tokens import TokenCodec, build_token_codec, load_keyring
+
+
+NEW_SECRET = "new-secret-" + "n" * 32
+OLD_SECRET = "old-secret-" + "o" * 32
+LEGACY_SECRET = "legacy-secret-" + "l" * 32
+
+
+def claims(**extra):
+    return {"sub": "user-1", "exp": int(time.time()) + 600, **extra}
+
+
+def sign(payload, secret, headers=None, algorithm="HS256"):
+    return jws.sign(orjson.dumps(payload), secret, headers=headers, algorithm=algorithm)
+
+
+@pytest.fixture
+def codec():
+    # "new" is active; "old" is retired but still in the ring
+    return TokenCodec(
+        {"new": NEW_SECRET, "old": OLD_SECRET},
+        "new",
+        "HS256",
+        legacy_secret=LEGACY_SECRET,
+    )
+
+
+def test_encode_signs_with_active_kid(codec):
+    token = codec.encode(claims())
+
+    assert jws.get_unverified_header(token)["kid"] == "new"
+    assert orjson.loads(jws.verify(token, NEW_SECRET, ["HS256"]))["sub"] == "user-1"
+    assert codec.decode(token)["sub"] == "user-1"
+
+
+def test_retired_kid_in_ring_still_verifies(codec):
+    token = sign(claims(), OLD_SECRET, headers={"kid": "old"})
+
+    assert codec.decode(token)["sub"] == "user-1"
+
+
+def test_retired_kid_removed_from_ring_is_rejected():
+    token = sign(claims(), OLD_SECRET, headers={"kid": "old"})
+    codec = TokenCodec({"new": NEW_SECRET}, "new", "HS256")
+
+    assert codec.decode(token) is None
+    assert codec.rejected == 1
+
+
+def test_legacy_token_without_kid_uses_legacy_secret(codec):
+    token = sign(claims(), LEGACY_SECRET)
+
+    assert "kid" not in jws.get_unverified_header(token)
+    assert codec.decode(token)["sub"] == "user-1"
+
+
+def test_legacy_token_rejected_without_legacy_secret():
+    token = sign(claims(), LEGACY_SECRET)
+    codec = TokenCodec({"new": NEW_SECRET}, "new", "HS256")
+
+    assert codec.decode(token) is None
+
+
+def test_unknown_kid_is_rejected(codec):
+    token = sign(claims(), NEW_SECRET, headers={"kid": "unknown"})
+
+    assert codec.decode(token) is None
+    assert codec.rejected == 1
+
+
+def test_kid_with_wrong_secret_is_rejected(codec):
+    token = sign(claims(), OLD_SECRET, headers={"kid": "new"})
+
+    assert codec.decode(token) is None
+
+
+def test_other_algorithm_is_rejected(codec):
+    # Right key and kid, but HS512 instead of the configured HS256
+    token = sign(claims(), NEW_SECRET, headers={"kid": "new"}, algorithm="HS512")
+
+    assert codec.decode(token) is None
+    assert codec.rejected == 1
+
+
+def test_expired_token_is_rejected(codec):
+    token = codec.encode(claims(exp=int(time.time()) - 1))
+
+    assert codec.decode(token) is None
+
+
+def test_refresh_type_is_checked(codec):
+    access = codec.encode(claims(type="access"))
+    refresh = codec.encode(claims(type="refresh"))
+
+    assert codec.decode(access, "refresh") is None
+    assert codec.decode(refresh, "refresh")["type"] == "refresh"
+
+
+def test_decode_cache_hits_on_repeat(codec):
+    token = codec.encode(claims())
+
+    codec.decode(token)
+    codec.decode(token)
+
+    assert (codec.misses, codec.hits) == (1, 1)
+
+
+def test_load_keyring_parses_keys_and_active_kid():
+    config = Settings(JWT_SIGNING_KEYS="k2:secret-two, k1:secret-one", JWT_ACTIVE_KID="k1")
+
+    keys, active_kid, legacy_secret, pinned = load_keyring(config)
+
+    assert keys == {"k2": "secret-two", "k1": "secret-one"}
+    assert active_kid == "k1"
+    assert legacy_secret is None
+    assert pinned
+
+
+def test_load_keyring_defaults_active_kid_to_first_entry():
+    config = Settings(JWT_SIGNING_KEYS="k2:secret-two,k1:secret-one", JWT_ACTIVE_KID=None)
+
+    assert load_keyring(config)[1] == "k2"
+
+
+def test_load_keyring_rejects_malformed_entries():
+    with pytest.raises(ValueError):
+        load_keyring(Settings(JWT_SIGNING_KEYS="no-separator"))
+
+
+def test_load_keyring_rejects_unknown_active_kid():
+    with pytest.raises(ValueError):
+        load_keyring(Settings(JWT_SIGNING_KEYS="k1:secret-one", JWT_ACTIVE_KID="k9"))
+
+
+def test_rotation_keeps_tokens_signed_before_the_switch():
+    before = build_token_codec(
+        Settings(JWT_SIGNING_KEYS="old:" + OLD_SECRET, JWT_ACTIVE_KID="old")
+    )
+    token = before.encode(claims())
+
+    after = build_token_codec(
+        Settings(JWT_SIGNING_KEYS=f"new:{NEW_SECRET},old:{OLD_SECRET}", JWT_ACTIVE_KID="new")
+    )
+
+    assert after.decode(token)["sub"] == "user-1"
+    assert jws.get_unverified_header(after.encode(claims()))["kid"] == "new"
@@ -0,0 +1,56 @@
+"""
+Vietnamese normalization tests
+Diacritic-insensitive name matching for profile search
+"""
+
+import unicodedata
+
+import pytest
+
+from app.core.vietnamese import build_search_name, normalize_vietnamese
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Nguyễn Văn An", "nguyen van an"),
+    ("Nguyen Van An", "nguyen van an"),
+    ("NGUYỄN VĂN AN", "nguyen van an"),
+    ("Đặng Thị Đào", "dang thi dao"),
+    ("đường", "duong"),
+    ("Trần  Thị\tHồng\nNhung", "tran thi hong nhung"),
+    ("  Lê Văn Tám  ", "le van tam"),
+    ("Phạm Ngọc Thạch", "pham ngoc thach"),
+    ("Huỳnh Tấn Phát", "huynh tan phat"),
+    ("Võ Nguyên Giáp", "vo nguyen giap"),
+    ("Ông Bà Ngoại", "ong ba ngoai"),
+    ("Nguyễn Ái Quốc", "nguyen ai quoc"),
+    ("Ưng Hoàng Phúc", "ung hoang phuc"),
+    ("John Smith", "john smith"),
+    ("", ""),
+    (None, ""),
+    ("   ", ""),
+])
+def test_normalize_vietnamese(text, expected):
+    assert normalize_vietnamese(text) == expected
+
+
+def test_precomposed_and_decomposed_input_match():
+    name = "Nguyễn Văn Đức"
+    decomposed = unicodedata.normalize("NFD", name)
+
+    assert decomposed != name
+    assert normalize_vietnamese(decomposed) == normalize_vietnamese(name) == "nguyen van duc"
+
+
+def test_unaccented_query_matches_accented_name():
+    assert normalize_vietnamese("nguyen van an") in normalize_vietnamese("Ông Nguyễn Văn An")
+    assert normalize_vietnamese("Dao") == normalize_vietnamese("Đào")
+
+
+@pytest.mark.parametrize("names, expected", [
+    (("Nguyễn Văn An", "Ông Ba", "Mr. An"), "nguyen van an ong ba mr. an"),
+    (("Nguyễn Văn An", None, ""), "nguyen van an"),
+    ((None, "  ", None), None),
+    ((), None),
+])
+def test_build_search_name(names, expected):
+    assert build_search_name(*names) == expected
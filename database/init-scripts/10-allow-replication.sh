@@ -0,0 +1,4 @@
+#!/bin/sh
+# Let the postgres-replica service stream WAL from this server
+set -e
+echo "host replication all all md5" >> "$PGDATA/pg_hba.conf"